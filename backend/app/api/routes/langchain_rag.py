@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import codecs
+import json
 from typing import Any, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Response, UploadFile
 from fastapi.responses import StreamingResponse
 
 from app.api.dependencies import (
@@ -27,23 +29,19 @@ if ELEVENLABS_AVAILABLE:
 
 router = APIRouter(prefix="/langchain-rag", tags=["LangChain RAG"])
 
-@router.post("/documents", summary="Store documents using LangChain")
-async def store_documents(
-    request: StoreDocumentsRequest,
-    rag_service: LangChainRAGService = Depends(get_langchain_rag_service),
-) -> dict[str, Any]:
-    """
-    Store documents in MongoDB vector store using LangChain.
+# Uploaded files larger than this are rejected with 413
+UPLOAD_MAX_BYTES = 32 * 1024 * 1024
+UPLOAD_READ_CHUNK_SIZE = 1024 * 1024
 
-    Documents will be chunked and embedded for semantic search.
-    """
+def _store_or_raise(
+    rag_service: LangChainRAGService,
+    texts: list[str],
+    metadatas: Optional[list[dict[str, Any]]],
+    source: Optional[str],
+) -> dict[str, Any]:
+    """Store documents, mapping failures to HTTP errors (400 for configuration, else 500)."""
     try:
-        result = rag_service.store_documents(
-            texts=request.texts,
-            metadatas=request.metadatas,
-            source=request.source,
-        )
-        return result
+        return rag_service.store_documents(texts=texts, metadatas=metadatas, source=source)
     except ValueError as e:
         error_msg = str(e)
         if "OPENAI_API_KEY" in error_msg or "API key" in error_msg or "AuthenticationError" in error_msg or "401" in error_msg:
@@ -75,6 +73,60 @@ async def store_documents(
             detail=error_message
         )
 
+@router.post("/documents", summary="Store documents using LangChain")
+async def store_documents(
+    request: StoreDocumentsRequest,
+    rag_service: LangChainRAGService = Depends(get_langchain_rag_service),
+) -> dict[str, Any]:
+    """
+    Store documents in MongoDB vector store using LangChain.
+
+    Documents will be chunked and embedded for semantic search.
+    """
+    return _store_or_raise(rag_service, request.texts, request.metadatas, request.source)
+
+@router.post("/documents/upload-file", summary="Store an uploaded text file using LangChain")
+async def upload_document_file(
+    file: UploadFile = File(..., description="UTF-8 text file"),
+    source: Optional[str] = Form(None, description="Source identifier (defaults to the file name)"),
+    metadata: Optional[str] = Form(None, description="JSON object of metadata for the document"),
+    rag_service: LangChainRAGService = Depends(get_langchain_rag_service),
+) -> dict[str, Any]:
+    """
+    Store an uploaded text file in MongoDB vector store using LangChain.
+
+    Multipart counterpart of POST /documents for large files, which avoids
+    JSON-escaping the text into a request model. The upload is read in
+    chunks and decoded incrementally; files over ``UPLOAD_MAX_BYTES`` are
+    rejected with 413 and invalid UTF-8 with 400.
+    """
+    try:
+        doc_metadata = json.loads(metadata) if metadata else {}
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=400, detail=f"metadata must be a JSON object: {e}")
+    if not isinstance(doc_metadata, dict):
+        raise HTTPException(status_code=400, detail="metadata must be a JSON object")
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    parts: list[str] = []
+    size = 0
+    try:
+        while chunk := await file.read(UPLOAD_READ_CHUNK_SIZE):
+            size += len(chunk)
+            if size > UPLOAD_MAX_BYTES:
+                raise HTTPException(
+                    status_code=413, detail=f"File exceeds the {UPLOAD_MAX_BYTES} byte upload limit"
+                )
+            parts.append(decoder.decode(chunk))
+        parts.append(decoder.decode(b"", final=True))
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="File must be UTF-8 encoded text")
+    finally:
+        await file.close()
+    text = "".join(parts)
+
+    doc_metadata.setdefault("filename", file.filename)
+    return _store_or_raise(rag_service, [text], [doc_metadata], source or file.filename)
+
 @router.post("/documents/search", summary="Search documents using LangChain")
 async def search_documents(
     request: LangChainSearchDocumentsRequest,
@@ -92,15 +144,16 @@ async def search_documents(
             filter=request.filter,
         )
         # Metadata should be normalized, but ensure it's done here as well
-        from app.utils.data_normalization import normalize_metadata
+        from app.utils.data_normalization import normalize_metadata_batch
         
-        normalized_results = []
-        for doc in documents:
-            normalized_meta = normalize_metadata(doc.metadata)
-            normalized_results.append({
+        normalized_metas = normalize_metadata_batch(doc.metadata for doc in documents)
+        normalized_results = [
+            {
                 "content": doc.page_content,
                 "metadata": normalized_meta,
-            })
+            }
+            for doc, normalized_meta in zip(documents, normalized_metas)
+        ]
         
         return {
             "success": True,
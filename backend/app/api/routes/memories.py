@@ -10,7 +10,7 @@ from fastapi import APIRouter, Depends, HTTPException
 from app.api.dependencies import get_memmachine_client
 from app.config import get_settings
 from app.models.schemas import AddMemoryRequest, SearchMemoryRequest
-from app.services.memmachine_client import MemMachineMCPClient
+from app.services.memmachine_client import MemMachineMCPClient, MemMachineUnavailable
 
 router = APIRouter(prefix="/memories", tags=["Memories"])
 
@@ -40,6 +40,12 @@ async def add_memory(
             "success": True,
             "result": result,
         }
+    except MemMachineUnavailable as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"MemMachine is required but unavailable: {e}. "
+                   f"Please start the MemMachine MCP server. See MemMachine/README.md for setup instructions."
+        )
     except ValueError as e:
         error_msg = str(e)
         if "not available" in error_msg.lower() or "not found" in error_msg.lower() or "Failed to connect" in error_msg:
@@ -77,6 +83,12 @@ async def search_memory(
             "success": True,
             "result": result,
         }
+    except MemMachineUnavailable as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"MemMachine is required but unavailable: {e}. "
+                   f"Please start the MemMachine MCP server. See MemMachine/README.md for setup instructions."
+        )
     except ValueError as e:
         error_msg = str(e)
         if "not available" in error_msg.lower() or "not found" in error_msg.lower() or "Failed to connect" in error_msg:
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from email.utils import parsedate_to_datetime
 from typing import Any, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Form
@@ -20,6 +21,15 @@ from pydantic import BaseModel
 
 router = APIRouter(prefix="/phone-call", tags=["Phone Calls"])
 
+def _twilio_timestamp_to_iso(timestamp: Optional[str]) -> Optional[str]:
+    """Convert a Twilio callback Timestamp (RFC 2822) to ISO 8601, or None if unparseable."""
+    if not timestamp:
+        return None
+    try:
+        return parsedate_to_datetime(timestamp).isoformat()
+    except (TypeError, ValueError):
+        return None
+
 class InitiateCallRequest(BaseModel):
     """Request model for initiating a phone call."""
     phone_number: str
@@ -107,26 +117,27 @@ Thank you for your time and feedback!"""
 
         # Make the actual phone call
         # Store customer info and initial script in active calls for conversation context
-        call_info = phone_service.make_call(
+        call_info = await phone_service.make_call(
             to_phone_number=phone_number,
             script_text=script,
         )
         
-        # Store conversation context
-        phone_service.active_calls[call_info["call_sid"]] = {
-            "call_info": call_info,
-            "script": script,
-            "status": "initiated",
-            "conversation_history": [
+        # Store conversation context. make_call() already created the call state and a
+        # status webhook may have advanced it since, so merge rather than replace
+        await phone_service.call_states.update(
+            call_info["call_sid"],
+            call_info=call_info,
+            script=script,
+            conversation_history=[
                 {"role": "agent", "content": script}
             ],
-            "question_count": 0,
-            "customer_info": {
+            question_count=0,
+            customer_info={
                 "customer_id": customer_id,
                 "customer_name": customer_name,
                 "phone_number": phone_number,
             },
-        }
+        )
 
         return {
             "success": True,
@@ -173,8 +184,8 @@ async def handle_twiml(
         phone_service = get_phone_call_service()
         
         # Get script from active calls
-        if call_sid in phone_service.active_calls:
-            call_context = phone_service.active_calls[call_sid]
+        call_context = await phone_service.call_states.get(call_sid)
+        if call_context is not None:
             script = call_context.get("script", "Hello, this is a call about our recent marketing campaigns. How are you doing today?")
         else:
             # Generate initial script if not found
@@ -182,8 +193,8 @@ async def handle_twiml(
 
 First, have you received any marketing communications from us recently, such as emails, text messages, or social media ads?"""
             
-            # Store in active calls
-            phone_service.active_calls[call_sid] = {
+            # Store in active calls unless a concurrent request created it first
+            await phone_service.call_states.create(call_sid, {
                 "script": script,
                 "status": "ringing",
                 "conversation_history": [],
@@ -191,7 +202,7 @@ First, have you received any marketing communications from us recently, such as
                 "customer_info": {
                     "phone_number": to_number,
                 },
-            }
+            })
 
         # Get webhook base URL
         import os
@@ -235,7 +246,7 @@ async def handle_call_input(
         phone_service = get_phone_call_service()
 
         # Get conversation history from active calls
-        call_context = phone_service.active_calls.get(call_sid, {})
+        call_context = await phone_service.call_states.get(call_sid) or {}
         conversation_history = call_context.get("conversation_history", [])
         customer_info = call_context.get("customer_info", {})
         question_count = call_context.get("question_count", 0)
@@ -320,12 +331,14 @@ Summarize what we learned and thank them. Keep it brief (under 15 words)."""
             "content": response_text
         })
 
-        # Update call context
-        phone_service.active_calls[call_sid] = {
-            **call_context,
+        # Update call context; only the conversation fields change, so concurrent status
+        # webhook writes are kept
+        conversation_updates = {
             "conversation_history": conversation_history,
             "question_count": question_count + 1,
         }
+        if not await phone_service.call_states.update(call_sid, **conversation_updates):
+            await phone_service.call_states.create(call_sid, {**call_context, **conversation_updates})
 
         # Determine if we should continue or end
         should_continue = question_count < 3  # Ask up to 3 questions
@@ -364,7 +377,7 @@ async def get_call_status(
     try:
         phone_service = get_phone_call_service()
         
-        status = phone_service.get_call_status(call_sid)
+        status = await phone_service.get_call_status(call_sid)
         return {
             "success": True,
             **status,
@@ -387,7 +400,7 @@ async def get_call_conversation(
 
     try:
         phone_service = get_phone_call_service()
-        call_context = phone_service.active_calls.get(call_sid, {})
+        call_context = await phone_service.call_states.get(call_sid) or {}
         conversation_history = call_context.get("conversation_history", [])
         customer_info = call_context.get("customer_info", {})
         
@@ -415,7 +428,8 @@ async def twilio_webhook(
     """
     Webhook endpoint for Twilio call status updates.
     
-    Twilio will POST to this endpoint when call status changes.
+    Twilio will POST to this endpoint when call status changes (it is passed
+    as the status callback when the call is created).
     """
     phone_service = get_phone_call_service()
     form_data = await request.form()
@@ -424,9 +438,16 @@ async def twilio_webhook(
     call_duration = form_data.get("CallDuration", "0")
     
     # Update call status in active calls
-    if call_sid in phone_service.active_calls:
-        phone_service.active_calls[call_sid]["status"] = call_status
-        phone_service.active_calls[call_sid]["duration"] = call_duration
+    updates = {
+        "status": call_status,
+        "duration": call_duration,
+        "direction": form_data.get("Direction"),
+    }
+    if call_status in ("completed", "failed", "busy", "no-answer", "canceled"):
+        updates["end_time"] = _twilio_timestamp_to_iso(form_data.get("Timestamp"))
+    # Upsert: the callback can arrive before make_call() stores the call; its create()
+    # then only adds the fields that are not already set here
+    await phone_service.call_states.upsert(call_sid, **updates)
     
     # Store call results
     # In production, save to database
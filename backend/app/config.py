@@ -41,6 +41,24 @@ class Settings(BaseSettings):
         validation_alias="MEMMACHINE_USER_ID",
         description="Default user ID for MemMachine operations.",
     )
+    memmachine_session_ttl: float = Field(
+        1800.0,
+        alias="MEMMACHINE_SESSION_TTL",
+        validation_alias="MEMMACHINE_SESSION_TTL",
+        description="Seconds an initialized MemMachine MCP session is reused before re-initializing.",
+    )
+    memmachine_search_cache_max_entries: int = Field(
+        1024,
+        alias="MEMMACHINE_SEARCH_CACHE_MAX_ENTRIES",
+        validation_alias="MEMMACHINE_SEARCH_CACHE_MAX_ENTRIES",
+        description="Maximum MemMachine search results cached in memory (0 disables caching).",
+    )
+    memmachine_search_cache_ttl: float = Field(
+        30.0,
+        alias="MEMMACHINE_SEARCH_CACHE_TTL",
+        validation_alias="MEMMACHINE_SEARCH_CACHE_TTL",
+        description="Seconds a cached MemMachine search result stays valid.",
+    )
 
     model_config = SettingsConfigDict(
         env_file=Path(__file__).resolve().parent.parent / ".env",
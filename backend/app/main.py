@@ -11,6 +11,7 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.api.routes import analytics, customers, email, health, langchain_rag, memories, phone_calls
 from app.config import get_settings
 from app.database import lifespan_context
+from app.middleware import GzipRequestMiddleware
 from app.services.memmachine_client import close_memmachine_client
 
 settings = get_settings()
@@ -96,6 +97,9 @@ else:
         expose_headers=["*"],  # Expose all headers
     )
 
+# Accept gzip-compressed request bodies (large batch uploads)
+app.add_middleware(GzipRequestMiddleware)
+
 # Include routers
 app.include_router(health.router)
 app.include_router(memories.router)
@@ -0,0 +1,78 @@
+"""ASGI middleware for the FastAPI application."""
+
+from __future__ import annotations
+
+import zlib
+
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Inflated request bodies above this size are rejected (guards against gzip bombs)
+MAX_INFLATED_BODY_SIZE = 64 * 1024 * 1024
+
+
+class GzipRequestMiddleware:
+    """Inflate request bodies sent with ``Content-Encoding: gzip``.
+
+    Lets bulk clients (e.g. the synthetic data importer) compress large JSON
+    uploads; requests without the header pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_size: int = MAX_INFLATED_BODY_SIZE):
+        self.app = app
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not _is_gzip_encoded(scope):
+            await self.app(scope, receive, send)
+            return
+
+        inflater = zlib.decompressobj(wbits=16 + zlib.MAX_WBITS)
+        parts: list[bytes] = []
+        size = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            try:
+                # Never inflate more than one byte past the limit
+                part = inflater.decompress(message.get("body", b""), self.max_body_size - size + 1)
+            except zlib.error:
+                await PlainTextResponse("Invalid gzip request body", status_code=400)(scope, receive, send)
+                return
+            size += len(part)
+            if size > self.max_body_size:
+                await PlainTextResponse("Request body too large", status_code=413)(scope, receive, send)
+                return
+            parts.append(part)
+            more_body = message.get("more_body", False)
+        # A truncated stream, or bytes after the gzip trailer, is not a valid body
+        if not inflater.eof or inflater.unused_data:
+            await PlainTextResponse("Invalid gzip request body", status_code=400)(scope, receive, send)
+            return
+        body = b"".join(parts)
+
+        headers = [
+            (name, value)
+            for name, value in scope["headers"]
+            if name not in (b"content-encoding", b"content-length")
+        ]
+        headers.append((b"content-length", str(len(body)).encode()))
+        body_sent = False
+
+        async def inflated_receive() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        await self.app({**scope, "headers": headers}, inflated_receive, send)
+
+
+def _is_gzip_encoded(scope: Scope) -> bool:
+    for name, value in scope["headers"]:
+        if name == b"content-encoding":
+            return value.strip().lower() == b"gzip"
+    return False
@@ -3,6 +3,9 @@
 from __future__ import annotations
 
 import os
+import threading
+from array import array
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any, Optional
 
@@ -10,6 +13,7 @@ from dotenv import load_dotenv
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_community.document_loaders import TextLoader
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
 from langchain_openai import OpenAIEmbeddings, ChatOpenAI
 
 # Optional import for Anthropic
@@ -41,13 +45,78 @@ from pymongo import MongoClient
 from pymongo.database import Database
 
 from app.database import get_database, get_client
-from app.services.memmachine_client import MemMachineMCPClient
-from app.utils.data_normalization import normalize_metadata, normalize_customer_summary
+from app.services.memmachine_client import MemMachineMCPClient, get_memmachine_client
+from app.utils.data_normalization import (
+    normalize_customer_summary,
+    normalize_metadata,
+    normalize_metadata_batch,
+)
 
 # Load .env file to ensure environment variables are available
 _env_path = Path(__file__).resolve().parent.parent.parent / ".env"
 load_dotenv(_env_path)
 
+# Vectors for this many distinct texts are kept in memory (~12 KB each at 1536 dims)
+EMBEDDING_CACHE_MAX_ENTRIES = 2048
+
+# Holds a write version per chunks collection, bumped on every store/delete. It lives
+# in MongoDB so a write on one worker invalidates search caches on all of them
+STORE_VERSIONS_COLLECTION = "store_versions"
+
+
+class _CachedEmbeddings(Embeddings):
+    """LRU cache in front of an embeddings model, keyed by the exact text.
+
+    Repeated queries and duplicate document texts are embedded once. Vectors
+    are kept as float arrays rather than lists of Python floats to keep each
+    entry compact. LangChain runs sync embedding calls in worker threads, so
+    the cache is guarded by a lock.
+    """
+
+    def __init__(self, embeddings: Embeddings, max_entries: int):
+        self.embeddings = embeddings
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, array] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, text: str) -> Optional[array]:
+        with self._lock:
+            vector = self._entries.get(text)
+            if vector is not None:
+                self._entries.move_to_end(text)
+            return vector
+
+    def _put(self, text: str, vector: array) -> None:
+        with self._lock:
+            self._entries[text] = vector
+            self._entries.move_to_end(text)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        # Embed each distinct uncached text once, then scatter back in input order
+        vectors: dict[str, array] = {}
+        misses = []
+        for text in dict.fromkeys(texts):
+            vector = self._get(text)
+            if vector is None:
+                misses.append(text)
+            else:
+                vectors[text] = vector
+        if misses:
+            for text, embedding in zip(misses, self.embeddings.embed_documents(misses)):
+                vectors[text] = array("d", embedding)
+                self._put(text, vectors[text])
+        return [vectors[text].tolist() for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        vector = self._get(text)
+        if vector is None:
+            vector = array("d", self.embeddings.embed_query(text))
+            self._put(text, vector)
+        return vector.tolist()
+
+
 class LangChainRAGService:
     """LangChain-based RAG service with MongoDB vector store."""
 
@@ -79,9 +148,12 @@ class LangChainRAGService:
 
             embedding_api_key = "not-set"
 
-        self.embeddings = OpenAIEmbeddings(
-            model=embedding_model or "text-embedding-3-small",
-            openai_api_key=embedding_api_key,
+        self.embeddings = _CachedEmbeddings(
+            OpenAIEmbeddings(
+                model=embedding_model or "text-embedding-3-small",
+                openai_api_key=embedding_api_key,
+            ),
+            EMBEDDING_CACHE_MAX_ENTRIES,
         )
 
         # Initialize LLM lazily (only when needed for RAG queries)
@@ -138,6 +210,17 @@ class LangChainRAGService:
 
             raise ValueError(f"{error_msg}. Please configure MongoDB Atlas Vector Search for production use.") from e
 
+    def get_store_key(self) -> tuple[str, str, int]:
+        """Return the backing chunks collection's identity plus its current write version."""
+        doc = self.db[STORE_VERSIONS_COLLECTION].find_one({"_id": self.collection_name}, {"version": 1})
+        return (self.db.name, self.collection_name, doc["version"] if doc else 0)
+
+    def _mark_store_changed(self) -> None:
+        """Invalidate cached search results for the backing chunks collection on every worker."""
+        self.db[STORE_VERSIONS_COLLECTION].update_one(
+            {"_id": self.collection_name}, {"$inc": {"version": 1}}, upsert=True
+        )
+
     @property
     def llm(self):
         """Lazy initialization of LLM (only when needed for RAG queries)."""
@@ -169,8 +252,6 @@ class LangChainRAGService:
     async def _get_memmachine_client(self) -> MemMachineMCPClient:
         """Get or create MemMachine client."""
         if self.memmachine_client is None:
-            from app.services.memmachine_client import get_memmachine_client
-
             self.memmachine_client = await get_memmachine_client()
         return self.memmachine_client
 
@@ -215,6 +296,7 @@ class LangChainRAGService:
             try:
                 # Use MongoDB Atlas Vector Search - production ready
                 ids = self.vector_store.add_documents(documents)
+                self._mark_store_changed()
                 return {
                     "success": True,
                     "document_count": len(texts),
@@ -857,10 +939,9 @@ Provide a natural, conversational response suitable for voice (ElevenLabs TTS):"
         docs = list(collection.find({}, limit=limit).sort("_id", -1))
 
         # Normalize metadata for all documents
+        normalized_metas = normalize_metadata_batch(doc.get("metadata") for doc in docs)
         normalized_docs = []
-        for doc in docs:
-            metadata = doc.get("metadata", {})
-            normalized_meta = normalize_metadata(metadata) if metadata else {}
+        for doc, normalized_meta in zip(docs, normalized_metas):
             normalized_docs.append({
                 "id": str(doc["_id"]),
                 "content_preview": doc["content"][:200] + "..." if len(doc["content"]) > 200 else doc["content"],
@@ -883,6 +964,7 @@ Provide a natural, conversational response suitable for voice (ElevenLabs TTS):"
             return {"success": False, "message": "Must provide source"}
 
         result = collection.delete_many(filter_query)
+        self._mark_store_changed()
         return {
             "success": True,
             "deleted_count": result.deleted_count,
@@ -2,30 +2,422 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import itertools
 import json
-from typing import Any, Optional
+import logging
+import random
+import socket
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, TypeVar
 
 import httpx
 
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class MemMachineUnavailable(ValueError):
+    """Raised when the MemMachine MCP server cannot be reached or initialized."""
+
+
+try:  # orjson parses large search payloads several times faster than stdlib json
+    import orjson
+
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:  # pragma: no cover - optional speedup
+    _json_loads = json.loads
+
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+try:  # HTTP/2 needs the optional h2 package (httpx[http2])
+    import h2  # noqa: F401
+
+    _HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - fall back to HTTP/1.1
+    _HTTP2_AVAILABLE = False
+
+# Upper bound on a single SSE tool response so a runaway stream is aborted
+# instead of being buffered without limit
+SSE_MAX_BYTES = 8 * 1024 * 1024
+# TCP options for the MemMachine connection pool
+_SOCKET_OPTIONS = [
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+    (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+]
+# Largest error body read from a failed tool call; the rest is discarded
+ERROR_BODY_MAX_BYTES = 64 * 1024
+# Default lifetime of an initialized MCP session before it is re-established
+DEFAULT_SESSION_TTL = 1800.0
+# Retry policy for transient tool-call failures (stale session, rate limiting, gateway errors)
+RETRY_MAX_TRIES = 4
+RETRY_BASE_DELAY = 0.1
+_RETRYABLE_STATUS_CODES = frozenset({401, 429, 502, 503, 504})
+# Statuses after which a non-idempotent call (add_memory) is known not to have been applied
+_NON_IDEMPOTENT_RETRYABLE_STATUS_CODES = frozenset({429, 503})
+# How long to wait for trailing SSE bytes after the result before giving up on reuse
+SSE_DRAIN_SECONDS = 1.0
+
+# Body of the MCP notifications/initialized message; it never changes
+_INITIALIZED_NOTIFICATION = _json_dumps({"jsonrpc": "2.0", "method": "notifications/initialized"})
+
+
+@functools.lru_cache(maxsize=None)
+def _tool_call_prefix(tool_name: str) -> bytes:
+    """Return the static, pre-serialized head of a ``tools/call`` request for a tool."""
+    return (
+        b'{"jsonrpc":"2.0","method":"tools/call","params":{"name":'
+        + _json_dumps(tool_name)
+        + b',"arguments":'
+    )
+
+
+_F = TypeVar("_F", bound=Callable[..., Awaitable[Any]])
+
+
+def _requires_session(fn: _F) -> _F:
+    """Ensure the MCP session is initialized before running a client method.
+
+    The hot path (session already established) is a single attribute check;
+    failure handling lives in the cold ``_ensure_session`` path.
+    """
+
+    @functools.wraps(fn)
+    async def wrapper(self: "MemMachineMCPClient", *args: Any, **kwargs: Any) -> Any:
+        if self.session_id is None or time.monotonic() >= self._session_expires_at:
+            await self._ensure_session()
+        return await fn(self, *args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
+
+
+async def _iter_sse_data(response: httpx.Response) -> AsyncIterator[bytes]:
+    """
+    Yield the payload of every ``data:`` line of an SSE response as raw bytes.
+
+    Lines are split at the byte level so ``event:``/comment lines are skipped
+    without being decoded. The stream is aborted once it exceeds
+    ``SSE_MAX_BYTES``, or once it has run longer than the request's read
+    timeout; a stalled stream is already cut off by httpx's per-read timeout,
+    so this only catches a producer trickling bytes to keep the read alive.
+    """
+    loop = asyncio.get_running_loop()
+    max_seconds = response.request.extensions.get("timeout", {}).get("read")
+    deadline = loop.time() + max_seconds if max_seconds is not None else None
+    bytes_read = 0
+    buffer = bytearray()
+
+    async for chunk in response.aiter_bytes():
+        bytes_read += len(chunk)
+        if bytes_read > SSE_MAX_BYTES:
+            raise ValueError(f"SSE response exceeded {SSE_MAX_BYTES} bytes")
+        if deadline is not None and loop.time() > deadline:
+            raise ValueError(f"SSE response exceeded {max_seconds}s")
+
+        buffer += chunk
+        start = 0
+        while True:
+            end = buffer.find(b"\n", start)
+            if end == -1:
+                break
+            if buffer.startswith(b"data:", start, end):
+                yield bytes(buffer[start + 5:end])
+            start = end + 1
+        del buffer[:start]
+
+    # A final data line may arrive without a trailing newline
+    if buffer.startswith(b"data:"):
+        yield bytes(buffer[5:])
+
+
+@dataclass
+class _SseOutcome:
+    """What a JSON-RPC response delivered over SSE contained."""
+
+    found_result: bool = False
+    result: Any = None
+    error: Optional[dict[str, Any]] = None
+    event_count: int = 0
+
+
+async def _read_sse_result(events: AsyncIterator[bytes]) -> _SseOutcome:
+    """
+    Decode JSON-RPC messages from SSE data payloads until a result arrives.
+
+    Errors are recorded and reading continues, since MemMachine may follow an
+    error message with a result. Reading stops at the first result, leaving
+    ``events`` un-exhausted so the caller can release the stream.
+    """
+    outcome = _SseOutcome()
+    async for payload in events:
+        outcome.event_count += 1
+        try:
+            data = _json_loads(payload)
+        except json.JSONDecodeError:
+            # Might be partial data - keep reading
+            continue
+        if "error" in data:
+            outcome.error = data["error"]
+        elif "result" in data:
+            outcome.found_result = True
+            outcome.result = data["result"]
+            break
+    return outcome
+
+
+async def _release_sse(events: AsyncIterator[bytes], response: httpx.Response) -> None:
+    """
+    Release an SSE response promptly once its result has been read.
+
+    An HTTP/2 stream (https servers only) is closed immediately, which
+    resets just that stream and leaves the shared connection usable. On
+    HTTP/1.1 closing with an unread body makes httpx drop the connection, so
+    the (normally empty) remainder is drained briefly to return the
+    connection to the pool.
+    """
+    if response.http_version == "HTTP/2" or response.headers.get("connection", "").lower() == "close":
+        await response.aclose()
+        return
+
+    async def _exhaust() -> None:
+        async for _ in events:
+            pass
+
+    try:
+        await asyncio.wait_for(_exhaust(), timeout=SSE_DRAIN_SECONDS)
+    except Exception:
+        # Draining is best-effort - closing the stream is always safe
+        pass
+    await response.aclose()
+
+
+async def _read_capped(response: httpx.Response, max_bytes: int) -> bytes:
+    """Read at most ``max_bytes`` of a streamed response body."""
+    chunks: list[bytes] = []
+    total = 0
+    async for chunk in response.aiter_bytes():
+        chunks.append(chunk[: max_bytes - total])
+        total += len(chunk)
+        if total >= max_bytes:
+            break
+    return b"".join(chunks)
+
+
+@dataclass
+class CircuitBreaker:
+    """
+    CLOSED -> OPEN -> HALF_OPEN breaker guarding calls to one MemMachine host.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    calls fail immediately. Once ``reset_timeout`` has elapsed a single probe
+    is let through; its outcome closes or re-opens the breaker.
+    """
+
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+    state: str = "closed"
+    fail_count: int = 0
+    opened_at: float = 0.0
+
+    def before_call(self) -> None:
+        """Raise immediately if the breaker is not admitting calls."""
+        if self.state == "closed":
+            return
+        now = time.monotonic()
+        if now - self.opened_at < self.reset_timeout:
+            raise MemMachineUnavailable("MemMachine circuit open")
+        # Window elapsed (or a stuck probe timed out) - let this call through as the probe
+        self.state = "half_open"
+        self.opened_at = now
+
+    def is_open(self) -> bool:
+        """Return True while the breaker is rejecting calls, without admitting a probe."""
+        return self.state == "open" and time.monotonic() - self.opened_at < self.reset_timeout
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self.fail_count = 0
+
+    def record_failure(self) -> None:
+        self.fail_count += 1
+        if self.state == "half_open" or self.fail_count >= self.failure_threshold:
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+
+def _parse_text_content(text: str) -> Any:
+    """Decode JSON text content, wrapping non-JSON text in a success message."""
+    try:
+        return _json_loads(text)
+    except json.JSONDecodeError:
+        return {"status": 200, "message": text}
+
+
+class _SearchCache:
+    """Small LRU cache with per-entry TTL for ``search_memory`` results.
+
+    Results are stored serialized, so every ``get`` returns a fresh object
+    that callers may mutate freely.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple[str, str, int], tuple[float, bytes]] = OrderedDict()
+        # Bumped by invalidate_user so searches started before a write don't cache stale results
+        self._generations: dict[str, int] = {}
+
+    def get(self, key: tuple[str, str, int]) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, raw = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return _json_loads(raw)
+
+    def generation(self, user_id: str) -> int:
+        """Return the invalidation generation of ``user_id``; pass it back to ``put``."""
+        return self._generations.get(user_id, 0)
+
+    def put(self, key: tuple[str, str, int], value: Any, generation: int) -> None:
+        """Cache ``value`` unless the user was invalidated since ``generation`` was read."""
+        if self.max_entries <= 0 or self._generations.get(key[0], 0) != generation:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, _json_dumps(value))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Drop every cached search for ``user_id``, including searches still in flight."""
+        self._generations[user_id] = self._generations.get(user_id, 0) + 1
+        for key in [k for k in self._entries if k[0] == user_id]:
+            del self._entries[key]
+
+
+class _TransientToolError(ValueError):
+    """A tool-call failure that may succeed when retried."""
+
+    def __init__(self, message: str, *, server_fault: bool = False):
+        super().__init__(message)
+        # Whether the failure counts against the circuit breaker once retries are exhausted
+        self.server_fault = server_fault
+
+
+class _ServerToolError(ValueError):
+    """A non-retryable tool-call failure caused by the server (HTTP 5xx)."""
+
+
+async def _retry(
+    call: Callable[[], Awaitable[Any]], *, max_tries: int = RETRY_MAX_TRIES, base: float = RETRY_BASE_DELAY
+) -> Any:
+    """
+    Await ``call()`` until it succeeds, retrying transient tool errors.
+
+    Sleeps use full jitter: a uniform delay in ``[0, base * 2**attempt]``.
+    """
+    for attempt in range(max_tries):
+        try:
+            return await call()
+        except _TransientToolError:
+            if attempt == max_tries - 1:
+                raise
+            await asyncio.sleep(random.uniform(0, base * 2 ** attempt))
+
+
 class MemMachineMCPClient:
     """Client for interacting with MemMachine MCP server via HTTP."""
 
-    def __init__(self, base_url: str = "http://localhost:8090", user_id: str = "default-user"):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:8090",
+        user_id: str = "default-user",
+        session_ttl: float = DEFAULT_SESSION_TTL,
+        max_concurrent_calls: int = 16,
+        queue_wait: float = 5.0,
+        search_cache_max_entries: int = 1024,
+        search_cache_ttl: float = 30.0,
+    ):
         """
         Initialize the MemMachine MCP client.
 
         Args:
             base_url: Base URL of the MemMachine MCP server
             user_id: Default user ID for memory operations
+            session_ttl: Seconds an initialized session is reused before re-initializing
+            max_concurrent_calls: Maximum number of tool calls in flight at once
+            queue_wait: Seconds a call may wait for a free slot before being rejected
+            search_cache_max_entries: Maximum cached search results (0 disables the cache)
+            search_cache_ttl: Seconds a cached search result stays valid
         """
         self.base_url = base_url.rstrip("/")
         self.mcp_url = f"{self.base_url}/mcp/"
         self.user_id = user_id
         self.session_id: Optional[str] = None
-        self.client = httpx.AsyncClient(timeout=60.0)  # Increased timeout for MemMachine operations
+        self.session_ttl = session_ttl
+        # Static per-client request headers; only mcp-session-id varies per request
+        self._base_headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json, text/event-stream",
+            "user-id": user_id,
+        }
+        self.queue_wait = queue_wait
+        # Monotonic deadline after which the cached session is considered stale
+        self._session_expires_at = 0.0
+        # Created on first use so the pool binds to the running event loop
+        self._client: Optional[httpx.AsyncClient] = None
         self._initialization_attempted = False
         self._initialization_failed = False
-        self._failure_reason: Optional[str] = None
+        # Session-state condition: one coroutine initializes, the rest wait for its outcome
+        self._init_cond = asyncio.Condition()
+        self._initializing = False
+        # In-flight notifications/initialized send, awaited on close()
+        self._pending_notif: Optional[asyncio.Task[None]] = None
+        # Bounds concurrent tool calls so a spike can't open unbounded streams
+        self._bulkhead = asyncio.Semaphore(max_concurrent_calls)
+        # Fails fast once MemMachine at this base_url keeps erroring or timing out
+        self._breaker = CircuitBreaker()
+        # Recent search results keyed on (user_id, query, limit)
+        self._search_cache = _SearchCache(search_cache_max_entries, search_cache_ttl)
+        # Per-client JSON-RPC id sequence so every request can be correlated with its response
+        self._next_id = itertools.count(1)
+
+    def _has_live_session(self) -> bool:
+        """Return True if a session is cached and its TTL has not elapsed."""
+        return self.session_id is not None and time.monotonic() < self._session_expires_at
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Return the shared HTTP client, creating it lazily on first use."""
+        if self._client is None:
+            # HTTP/2 is only negotiated via TLS ALPN (httpx does not do h2c), so it is
+            # requested for https URLs when h2 is installed; plain http stays on
+            # HTTP/1.1. Nagle is disabled for the small latency-sensitive JSON-RPC
+            # writes, and connections are kept alive across idle gaps between user turns
+            transport = httpx.AsyncHTTPTransport(
+                http2=_HTTP2_AVAILABLE and self.base_url.startswith("https://"),
+                retries=0,
+                limits=httpx.Limits(
+                    max_keepalive_connections=20,
+                    max_connections=40,
+                    keepalive_expiry=600.0,
+                ),
+                socket_options=_SOCKET_OPTIONS,
+            )
+            self._client = httpx.AsyncClient(
+                transport=transport,
+                timeout=60.0,  # Increased timeout for MemMachine operations
+            )
+        return self._client
 
     async def _get_session_id(self, force_refresh: bool = False) -> str:
         """Get or retrieve a session ID from the MCP server."""
@@ -33,46 +425,46 @@ class MemMachineMCPClient:
             return self.session_id
 
         try:
+            # Reuse the pooled client so the session GET rides the keep-alive connection
             # Increase timeout for session ID retrieval - MemMachine may be slow
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    self.mcp_url,
-                    headers={"Accept": "text/event-stream"},
-                    timeout=15.0,  # Increased from 5.0 to 15.0 seconds
+            response = await self.client.get(
+                self.mcp_url,
+                headers={"Accept": "text/event-stream"},
+                timeout=15.0,  # Increased from 5.0 to 15.0 seconds
+            )
+            
+            # Check if the endpoint exists
+            if response.status_code == 404:
+                raise ValueError(
+                    f"MemMachine MCP server endpoint not found at {self.mcp_url}. "
+                    f"Please ensure the MemMachine MCP server is running. "
+                    f"See MemMachine/README.md for setup instructions."
                 )
-                
-                # Check if the endpoint exists
-                if response.status_code == 404:
-                    raise ValueError(
-                        f"MemMachine MCP server endpoint not found at {self.mcp_url}. "
-                        f"Please ensure the MemMachine MCP server is running. "
-                        f"See MemMachine/README.md for setup instructions."
-                    )
-                
-                # Check if we got a session ID (even if status is not 200)
-                self.session_id = response.headers.get("mcp-session-id")
-                
-                # If we have a session ID, use it even if status is not 200 (some servers return 400 but still provide session)
-                # This is expected behavior - MemMachine may return 400 but still provide a valid session ID
-                if self.session_id:
-                    # Only log if it's unexpected (not 200 or 400)
-                    if response.status_code not in (200, 400):
-                        # Unexpected status code, but we have a session ID so continue
-                        pass
-                    return self.session_id
-                
-                # If no session ID and status is not 200, raise error
-                if response.status_code != 200:
-                    raise ValueError(
-                        f"MemMachine MCP server returned status {response.status_code} without a session ID. "
-                        f"Please check if the server is running at {self.base_url}"
-                    )
-                
-                # Should not reach here, but handle it
+            
+            # Check if we got a session ID (even if status is not 200)
+            self.session_id = response.headers.get("mcp-session-id")
+            
+            # If we have a session ID, use it even if status is not 200 (some servers return 400 but still provide session)
+            # This is expected behavior - MemMachine may return 400 but still provide a valid session ID
+            if self.session_id:
+                # Only log if it's unexpected (not 200 or 400)
+                if response.status_code not in (200, 400):
+                    # Unexpected status code, but we have a session ID so continue
+                    pass
+                return self.session_id
+            
+            # If no session ID and status is not 200, raise error
+            if response.status_code != 200:
                 raise ValueError(
-                    f"MemMachine MCP server at {self.mcp_url} did not return a session ID. "
-                    f"The server may not be properly configured or may be using a different protocol version."
+                    f"MemMachine MCP server returned status {response.status_code} without a session ID. "
+                    f"Please check if the server is running at {self.base_url}"
                 )
+            
+            # Should not reach here, but handle it
+            raise ValueError(
+                f"MemMachine MCP server at {self.mcp_url} did not return a session ID. "
+                f"The server may not be properly configured or may be using a different protocol version."
+            )
         except httpx.ConnectError as e:
             # Clear session ID on connection error
             self.session_id = None
@@ -90,26 +482,18 @@ class MemMachineMCPClient:
 
     async def _initialize_session(self) -> None:
         """Initialize the MCP session."""
-        # Skip if we've already failed to initialize
-        if self._initialization_failed:
-            raise ValueError(
-                f"MemMachine MCP server initialization previously failed: {self._failure_reason}. "
-                f"Please check the server status at {self.base_url}"
-            )
-        
         # Mark that we're attempting initialization
         self._initialization_attempted = True
         
         try:
             session_id = await self._get_session_id()
-        except Exception as e:
+        except Exception:
             self._initialization_failed = True
-            self._failure_reason = str(e)
             raise
 
         payload = {
             "jsonrpc": "2.0",
-            "id": 1,
+            "id": next(self._next_id),
             "method": "initialize",
             "params": {
                 "protocolVersion": "2024-11-05",
@@ -124,37 +508,15 @@ class MemMachineMCPClient:
         async with self.client.stream(
             "POST",
             self.mcp_url,
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json, text/event-stream",
-                "mcp-session-id": session_id,
-                "user-id": self.user_id,
-            },
-            json=payload,
+            headers={**self._base_headers, "mcp-session-id": session_id},
+            content=_json_dumps(payload),
             timeout=60.0,  # Increased timeout for initialization - MemMachine can be slow
         ) as response:
             # MemMachine may return 400 even when initialization works - check for result in SSE stream
-            initialized = False
-            init_error = None
-            
             # Parse SSE response to check if initialization succeeded
-            async for line in response.aiter_lines():
-                if line:
-                    line_str = line.decode("utf-8") if isinstance(line, bytes) else line
-                    if line_str.startswith("event: message"):
-                        continue
-                    elif line_str.startswith("data:"):
-                        try:
-                            data = json.loads(line_str[5:].strip())
-                            if "result" in data:
-                                initialized = True
-                                # Store the result for debugging if needed
-                                break
-                            elif "error" in data:
-                                # If there's an error, store it but continue to check for result
-                                init_error = data["error"]
-                        except json.JSONDecodeError:
-                            continue
+            outcome = await _read_sse_result(_iter_sse_data(response))
+            initialized = outcome.found_result
+            init_error = outcome.error
             
             # Check if initialization failed
             if init_error:
@@ -167,48 +529,133 @@ class MemMachineMCPClient:
                 else:
                     raise ValueError("Failed to initialize session: No result received in SSE stream")
 
-            # Send initialized notification (required by MCP protocol)
-            try:
-                notif_response = await self.client.post(
-                    self.mcp_url,
-                    headers={
-                        "Content-Type": "application/json",
-                        "Accept": "application/json, text/event-stream",
-                        "mcp-session-id": session_id,
-                        "user-id": self.user_id,
-                    },
-                    json={
-                        "jsonrpc": "2.0",
-                        "method": "notifications/initialized",
-                    },
-                    timeout=10.0,
-                )
-                # Notification response status 202 is expected (Accepted)
-                if notif_response.status_code not in (200, 202):
-                    # Unexpected status, but notification failure is not critical
-                    pass
-            except Exception:
-                # Notification failure is not critical - don't fail initialization
+            # Send initialized notification (required by MCP protocol). It has no
+            # response body to wait on, so it is pipelined instead of awaited inline.
+            self._pending_notif = asyncio.create_task(
+                self._send_initialized_notification(session_id)
+            )
+
+    async def _send_initialized_notification(self, session_id: str) -> None:
+        """Send the MCP ``notifications/initialized`` message for a new session."""
+        try:
+            notif_response = await self.client.post(
+                self.mcp_url,
+                headers={**self._base_headers, "mcp-session-id": session_id},
+                content=_INITIALIZED_NOTIFICATION,
+                timeout=10.0,
+            )
+            # Notification response status 202 is expected (Accepted)
+            if notif_response.status_code not in (200, 202):
+                # Unexpected status, but notification failure is not critical
                 pass
+        except Exception:
+            # Notification failure is not critical - don't fail initialization
+            pass
+
+    async def _ensure_session(self) -> None:
+        """
+        Ensure an initialized MCP session exists.
+
+        Exactly one coroutine runs the initialization handshake; concurrent
+        callers wait on the session-state condition and share its outcome.
+        """
+        async with self._init_cond:
+            if self._initializing:
+                await self._init_cond.wait_for(lambda: not self._initializing)
+                if self._has_live_session() and not self._initialization_failed:
+                    return
+                raise MemMachineUnavailable("MemMachine MCP server is not available")
+            if self._has_live_session() and not self._initialization_failed:
+                return
+            # Don't attempt the handshake while the breaker is open. This check must not
+            # change state: the tool call that needs the session has already been admitted
+            # (possibly as the half-open probe) by before_call()
+            if self._breaker.is_open():
+                raise MemMachineUnavailable("MemMachine circuit open")
+            self._initializing = True
+
+        try:
+            # Clear failure state and any expired session, then initialize afresh
+            self._initialization_failed = False
+            self.session_id = None
+            await self._initialize_session()
+            self._session_expires_at = time.monotonic() + self.session_ttl
+            self._breaker.record_success()
+        except Exception as e:
+            self._breaker.record_failure()
+            # Drop any half-established session so the fast-path check retries init
+            self.session_id = None
+            self._initialization_failed = True
+            # Log the detailed reason once; callers get a cheap typed exception
+            logger.warning("MemMachine session initialization failed at %s: %s", self.base_url, e)
+            raise MemMachineUnavailable("MemMachine MCP server is not available") from e
+        finally:
+            async with self._init_cond:
+                self._initializing = False
+                self._init_cond.notify_all()
+
+    async def _reset_session(self) -> None:
+        """Invalidate the current session so the next caller re-initializes it."""
+        async with self._init_cond:
+            self.session_id = None
+            self._session_expires_at = 0.0
+            self._init_cond.notify_all()
 
     async def _call_tool(
-        self, tool_name: str, arguments: dict[str, Any], request_id: int = 1, force_refresh: bool = False
+        self,
+        tool_name: str,
+        arguments: dict[str, Any],
+        request_id: Optional[int] = None,
+        idempotent: bool = True,
     ) -> dict[str, Any]:
         """
         Call an MCP tool and return the result.
 
+        Transient failures (stale session, rate limiting, gateway errors) are
+        retried with jittered exponential backoff; invalid requests are not.
+        Non-idempotent tools are only retried when the request provably was
+        not applied: connect failures and 429/503 responses. A call counts as
+        at most one circuit-breaker failure, however many attempts it made.
+
         Args:
             tool_name: Name of the tool to call
             arguments: Arguments for the tool
-            request_id: JSON-RPC request ID
+            request_id: JSON-RPC request ID (defaults to the next id in this client's sequence)
+            idempotent: Whether the tool can safely be re-sent after an ambiguous failure
 
         Returns:
             Tool result as a dictionary
         """
+        if request_id is None:
+            request_id = next(self._next_id)
+        retryable = _RETRYABLE_STATUS_CODES if idempotent else _NON_IDEMPOTENT_RETRYABLE_STATUS_CODES
+        try:
+            return await _retry(
+                lambda: self._call_tool_once(tool_name, arguments, request_id, retryable)
+            )
+        except (httpx.TransportError, _ServerToolError):
+            self._breaker.record_failure()
+            raise
+        except _TransientToolError as e:
+            if e.server_fault:
+                self._breaker.record_failure()
+            raise
+
+    async def _call_tool_once(
+        self,
+        tool_name: str,
+        arguments: dict[str, Any],
+        request_id: int,
+        retryable: frozenset[int] = _RETRYABLE_STATUS_CODES,
+    ) -> dict[str, Any]:
+        """Perform a single ``tools/call`` round-trip."""
+        # Fail fast while the breaker is open instead of paying connect/read timeouts
+        self._breaker.before_call()
+
         # Ensure we have an initialized session before calling tools
-        # If we don't have a session ID, initialize the session first
-        if not self.session_id:
-            await self._initialize_session()
+        # If we don't have a live session, initialize the session first
+        if not self._has_live_session():
+            await self._ensure_session()
         
         # Use the stored session ID (should be set by _initialize_session)
         if not self.session_id:
@@ -216,158 +663,143 @@ class MemMachineMCPClient:
         
         session_id = self.session_id
 
-        payload = {
-            "jsonrpc": "2.0",
-            "id": request_id,
-            "method": "tools/call",
-            "params": {
-                "name": tool_name,
-                "arguments": arguments,
-            },
-        }
+        # Splice the variable parts into a pre-serialized JSON-RPC envelope
+        body = b"".join(
+            (
+                _tool_call_prefix(tool_name),
+                _json_dumps(arguments),
+                b'},"id":',
+                str(request_id).encode(),
+                b"}",
+            )
+        )
 
-        async with self.client.stream(
-            "POST",
-            self.mcp_url,
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json, text/event-stream",
-                "mcp-session-id": session_id,
-                "user-id": self.user_id,
-            },
-            json=payload,
-            timeout=60.0,  # Increased timeout for tool calls - MemMachine can be slow
-        ) as response:
-            if response.status_code != 200:
-                error_text = await response.aread()
-                error_message = error_text.decode() if error_text else ""
-                
-                # If we got a 400 or 401, the session might be invalid - clear it and retry once
-                if response.status_code in (400, 401) and not force_refresh:
-                    # Session might be invalid, attempting to refresh session
-                    self.session_id = None  # Clear invalid session
-                    # Retry with a fresh session (only once)
-                    try:
-                        new_session_id = await self._get_session_id(force_refresh=True)
-                        # Retry the call with new session
-                        return await self._call_tool(tool_name, arguments, request_id=request_id)
-                    except Exception as retry_error:
-                        raise ValueError(
-                            f"Failed to call tool {tool_name} even after session refresh: {response.status_code}, {error_message}. Retry error: {str(retry_error)}"
-                        )
+        # Bulkhead: cap in-flight tool calls and shed load rather than queueing forever
+        try:
+            await asyncio.wait_for(self._bulkhead.acquire(), timeout=self.queue_wait)
+        except asyncio.TimeoutError:
+            raise MemMachineUnavailable("MemMachine client is saturated") from None
+        try:
+            try:
+                async with self.client.stream(
+                    "POST",
+                    self.mcp_url,
+                    headers={**self._base_headers, "mcp-session-id": session_id},
+                    content=body,
+                    timeout=60.0,  # Increased timeout for tool calls - MemMachine can be slow
+                ) as response:
+                    # Server faults are recorded by _call_tool once retries are exhausted
+                    if response.status_code < 500:
+                        self._breaker.record_success()
+
+                    if response.status_code != 200:
+                        error_text = await _read_capped(response, ERROR_BODY_MAX_BYTES)
+                        error_message = error_text.decode(errors="replace") if error_text else ""
+                        message = f"Failed to call tool {tool_name}: {response.status_code}, {error_message}"
                 
-                raise ValueError(
-                    f"Failed to call tool {tool_name}: {response.status_code}, {error_message}"
-                )
-
-            # Parse SSE response - MemMachine returns results in SSE stream
-            result_found = False
-            error_found = None
-            all_lines = []
-            
-            async for line in response.aiter_lines():
-                if line:
-                    line_str = line.decode("utf-8") if isinstance(line, bytes) else line
-                    all_lines.append(line_str)
-                    
-                    if line_str.startswith("event: message"):
-                        continue
-                    elif line_str.startswith("data:"):
-                        try:
-                            data = json.loads(line_str[5:].strip())
-                            
-                            # Check for errors first
-                            if "error" in data:
-                                error_found = data["error"]
-                                # Don't break immediately - continue to check for result
-                                continue
-                            
-                            # Check for result
-                            if "result" in data:
-                                result_found = True
-                                result = data["result"]
-                                
-                                # Handle different result formats from MemMachine
-                                # Format 1: List with text content [{"type": "text", "text": "{\"status\":200,...}"}]
-                                if isinstance(result, list) and len(result) > 0:
-                                    text_content = result[0].get("text", "")
-                                    if text_content:
-                                        try:
-                                            # Try to parse JSON from text content
-                                            parsed = json.loads(text_content)
-                                            return parsed
-                                        except json.JSONDecodeError:
-                                            # If not JSON, return the text content as dict
-                                            return {"status": 200, "message": text_content}
-                                    # If no text, return the list itself
-                                    return result
-                                
-                                # Format 2: Direct dict - check for structuredContent first (MemMachine format)
-                                elif isinstance(result, dict):
-                                    # MemMachine returns structuredContent which contains the actual result
-                                    if "structuredContent" in result:
-                                        return result["structuredContent"]
-                                    # Check if it has nested content
-                                    if "content" in result:
-                                        content = result["content"]
-                                        # Content can be a list of objects with text fields
-                                        if isinstance(content, list) and len(content) > 0:
-                                            # Extract text from first item if it's a list
-                                            text_content = content[0].get("text", "")
-                                            if text_content:
-                                                try:
-                                                    return json.loads(text_content)
-                                                except json.JSONDecodeError:
-                                                    return {"status": 200, "message": text_content}
-                                        elif isinstance(content, dict):
-                                            return content
-                                        elif isinstance(content, str):
-                                            try:
-                                                return json.loads(content)
-                                            except json.JSONDecodeError:
-                                                return {"status": 200, "message": content}
-                                    # Return dict as-is if no nested structure
-                                    return result
-                                
-                                # Format 3: Other formats - return as-is
-                                return result
-                                
-                        except json.JSONDecodeError as e:
-                            # Log but continue - might be partial data
-                            continue
-            
-            # If we found an error, raise it with detailed information
-            if error_found:
-                error_code = error_found.get("code", -1)
-                error_message = error_found.get("message", "Unknown error")
-                error_data = error_found.get("data", "")
+                        # A 401 means the session is invalid - clear it so the retry re-initializes
+                        if response.status_code == 401:
+                            await self._reset_session()  # Clear invalid session and wake waiters
+                        if response.status_code in retryable:
+                            raise _TransientToolError(message, server_fault=response.status_code >= 500)
+                        if response.status_code >= 500:
+                            raise _ServerToolError(message)
+                        raise ValueError(message)
+
+                    # Parse SSE response - MemMachine returns results in SSE stream
+                    events = _iter_sse_data(response)
+                    outcome = await _read_sse_result(events)
+                    if outcome.found_result:
+                        # Free the stream/connection right away rather than at context exit
+                        await _release_sse(events, response)
+                        # Unwrap the MCP envelope once; MemMachine's formats are handled there
+                        return self._unwrap_result(outcome.result)
+
+                    error_found = outcome.error
+                    # If we found an error, raise it with detailed information
+                    if error_found:
+                        error_code = error_found.get("code", -1)
+                        error_message = error_found.get("message", "Unknown error")
+                        error_data = error_found.get("data", "")
                 
-                # Provide helpful error messages based on error code
-                if error_code == -32602:  # Invalid params
+                        # Provide helpful error messages based on error code
+                        if error_code == -32602:  # Invalid params
+                            raise ValueError(
+                                f"MCP error: Invalid request parameters for tool '{tool_name}'. "
+                                f"Error code: {error_code}, Message: {error_message}. "
+                                f"Data: {error_data}. "
+                                f"Arguments sent: {json.dumps(arguments, indent=2)}. "
+                                f"Please check that all required parameters are provided in the correct format."
+                            )
+                        elif error_code == -32603:  # Internal error
+                            raise ValueError(
+                                f"MCP error: Internal server error for tool '{tool_name}'. "
+                                f"Error: {error_message}. Data: {error_data}"
+                            )
+                        else:
+                            raise ValueError(f"MCP error for tool '{tool_name}': {error_found}")
+
+                    # If no result and no error, that's unexpected
                     raise ValueError(
-                        f"MCP error: Invalid request parameters for tool '{tool_name}'. "
-                        f"Error code: {error_code}, Message: {error_message}. "
-                        f"Data: {error_data}. "
-                        f"Arguments sent: {json.dumps(arguments, indent=2)}. "
-                        f"Please check that all required parameters are provided in the correct format."
+                        f"No result found in response for tool '{tool_name}'. "
+                        f"Response status: {response.status_code}. "
+                        f"Received {outcome.event_count} data events in SSE stream. "
+                        f"The server may not have returned a valid response."
                     )
-                elif error_code == -32603:  # Internal error
-                    raise ValueError(
-                        f"MCP error: Internal server error for tool '{tool_name}'. "
-                        f"Error: {error_message}. Data: {error_data}"
-                    )
-                else:
-                    raise ValueError(f"MCP error for tool '{tool_name}': {error_found}")
+            except (httpx.ConnectError, httpx.ConnectTimeout) as e:
+                # Nothing was sent, so even non-idempotent calls are safe to retry
+                raise _TransientToolError(
+                    f"Failed to connect to MemMachine MCP server at {self.base_url}: {e}",
+                    server_fault=True,
+                ) from e
+        finally:
+            self._bulkhead.release()
+
+    @staticmethod
+    def _unwrap_result(result: Any) -> Any:
+        """
+        Unwrap an MCP ``tools/call`` result envelope into the tool's payload.
 
-            # If no result and no error, that's unexpected
-            if not result_found:
-                raise ValueError(
-                    f"No result found in response for tool '{tool_name}'. "
-                    f"Response status: {response.status_code}. "
-                    f"Received {len(all_lines)} lines in SSE stream. "
-                    f"The server may not have returned a valid response."
-                )
+        MemMachine's ``structuredContent`` is checked first since it is the
+        common case; text content is JSON-decoded, falling back to a
+        ``{"status": 200, "message": text}`` dict for plain text.
+        """
+        result_type = type(result)
+        if result_type is dict:
+            # MemMachine returns structuredContent which contains the actual result
+            structured = result.get("structuredContent")
+            if structured is not None:
+                return structured
+            content = result.get("content")
+            content_type = type(content)
+            if content_type is dict:
+                return content
+            if content_type is str:
+                return _parse_text_content(content)
+            # Content can be a list of objects with text fields
+            if content_type is list and content:
+                text_content = content[0].get("text")
+                if text_content:
+                    return _parse_text_content(text_content)
+            # Return dict as-is if no nested structure
+            return result
+        # List with text content [{"type": "text", "text": "{\"status\":200,...}"}]
+        if result_type is list and result:
+            text_content = result[0].get("text")
+            if text_content:
+                return _parse_text_content(text_content)
+        return result
+
+    @staticmethod
+    def _tool_content(result: Any) -> Any:
+        """Return the ``content`` field of a MemMachine response (e.g. search results), if any."""
+        if type(result) is dict:
+            content = result.get("content")
+            if content is not None:
+                return content
+        return result
 
+    @_requires_session
     async def add_memory(
         self, content: str, user_id: Optional[str] = None
     ) -> dict[str, Any]:
@@ -381,26 +813,12 @@ class MemMachineMCPClient:
         Returns:
             Result dictionary with status and message
         """
-        # Always ensure session is initialized before calling tools
-        if not self.session_id or self._initialization_failed:
-            try:
-                # Clear failure state and retry initialization
-                if self._initialization_failed:
-                    self._initialization_failed = False
-                    self._failure_reason = None
-                    self.session_id = None
-                await self._initialize_session()
-            except Exception as e:
-                self._initialization_failed = True
-                self._failure_reason = str(e)
-                raise ValueError(f"MemMachine unavailable: {e}") from e
-        
         user_id = user_id or self.user_id
 
         # Ensure we have valid parameters
-        if not content or not content.strip():
+        if not content or content.isspace():
             raise ValueError("Memory content cannot be empty")
-        if not user_id or not user_id.strip():
+        if not user_id or user_id.isspace():
             raise ValueError("User ID cannot be empty")
 
         result = await self._call_tool(
@@ -411,18 +829,15 @@ class MemMachineMCPClient:
                     "content": content,
                 }
             },
-            request_id=1,
+            idempotent=False,
         )
+        # New memories can change search results for this user
+        self._search_cache.invalidate_user(user_id)
 
         # Parse the result (may be in different formats)
-        if isinstance(result, list) and len(result) > 0:
-            text_content = result[0].get("text", "")
-            if text_content:
-                return json.loads(text_content)
-        elif isinstance(result, dict) and "content" in result:
-            return result["content"]
-        return result
+        return self._tool_content(result)
 
+    @_requires_session
     async def search_memory(
         self, query: str, limit: int = 5, user_id: Optional[str] = None
     ) -> dict[str, Any]:
@@ -437,30 +852,23 @@ class MemMachineMCPClient:
         Returns:
             Search results dictionary
         """
-        # Always ensure session is initialized before calling tools
-        if not self.session_id or self._initialization_failed:
-            try:
-                # Clear failure state and retry initialization
-                if self._initialization_failed:
-                    self._initialization_failed = False
-                    self._failure_reason = None
-                    self.session_id = None
-                await self._initialize_session()
-            except Exception as e:
-                self._initialization_failed = True
-                self._failure_reason = str(e)
-                raise ValueError(f"MemMachine unavailable: {e}") from e
-        
         user_id = user_id or self.user_id
 
         # Ensure we have valid parameters
-        if not query or not query.strip():
+        if not query or query.isspace():
             raise ValueError("Search query cannot be empty")
-        if not user_id or not user_id.strip():
+        if not user_id or user_id.isspace():
             raise ValueError("User ID cannot be empty")
         if limit < 1 or limit > 50:
             limit = max(1, min(50, limit))  # Clamp to valid range
 
+        cache_key = (user_id, query, limit)
+        cached = self._search_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        # Read before the call so an add_memory that lands meanwhile blocks the put
+        generation = self._search_cache.generation(user_id)
+
         result = await self._call_tool(
             "search_memory",
             {
@@ -470,43 +878,59 @@ class MemMachineMCPClient:
                     "limit": limit,
                 }
             },
-            request_id=2,
         )
 
         # Parse the result (may be in different formats)
-        if isinstance(result, list) and len(result) > 0:
-            text_content = result[0].get("text", "")
-            if text_content:
-                return json.loads(text_content)
-        elif isinstance(result, dict) and "content" in result:
-            return result["content"]
+        result = self._tool_content(result)
+        self._search_cache.put(cache_key, result, generation)
         return result
 
     async def close(self) -> None:
-        """Close the HTTP client."""
-        await self.client.aclose()
+        """Close the HTTP client. Safe to call more than once."""
+        pending = self._pending_notif
+        self._pending_notif = None
+        if pending is not None and not pending.done():
+            await pending
+        client = self._client
+        if client is None or client.is_closed:
+            return
+        await client.aclose()
 
 # Global client instance
 _memmachine_client: Optional[MemMachineMCPClient] = None
+# Guards creation and teardown of the global client so they never interleave
+_client_lock = asyncio.Lock()
 
 async def get_memmachine_client() -> MemMachineMCPClient:
     """Get or create the global MemMachine MCP client instance."""
     global _memmachine_client
-    if _memmachine_client is None:
-        from app.config import get_settings
-
-        settings = get_settings()
-        mcp_url = settings.memmachine_mcp_url
-        user_id = settings.memmachine_user_id
-        _memmachine_client = MemMachineMCPClient(base_url=mcp_url, user_id=user_id)
-        # Don't initialize session eagerly - let it initialize on first use
-        # This allows the app to start even if MemMachine is not available
-    return _memmachine_client
+    # Fast path: a single global load once the client exists
+    client = _memmachine_client
+    if client is not None:
+        return client
+
+    async with _client_lock:
+        if _memmachine_client is None:
+            settings = get_settings()
+            mcp_url = settings.memmachine_mcp_url
+            user_id = settings.memmachine_user_id
+            _memmachine_client = MemMachineMCPClient(
+                base_url=mcp_url,
+                user_id=user_id,
+                session_ttl=settings.memmachine_session_ttl,
+                search_cache_max_entries=settings.memmachine_search_cache_max_entries,
+                search_cache_ttl=settings.memmachine_search_cache_ttl,
+            )
+            # Don't initialize session eagerly - let it initialize on first use
+            # This allows the app to start even if MemMachine is not available
+        return _memmachine_client
 
 async def close_memmachine_client() -> None:
-    """Close the global MemMachine MCP client."""
+    """Close the global MemMachine MCP client. Idempotent under concurrent shutdown."""
     global _memmachine_client
-    if _memmachine_client:
-        await _memmachine_client.close()
+    async with _client_lock:
+        client = _memmachine_client
         _memmachine_client = None
+        if client is not None:
+            await client.close()
 
@@ -2,27 +2,47 @@
 
 from __future__ import annotations
 
+import asyncio
+import functools
+import hashlib
 import os
 import io
+import json
+import logging
+import re
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional, Dict, Any
 from enum import Enum
+from xml.sax.saxutils import escape as _xml_escape
 
 from dotenv import load_dotenv
 
+logger = logging.getLogger(__name__)
+
 # Load .env file
 _env_path = Path(__file__).resolve().parent.parent.parent / ".env"
 load_dotenv(_env_path)
 
 try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from twilio.http.http_client import TwilioHttpClient
     from twilio.rest import Client as TwilioClient
-    from twilio.twiml.voice_response import VoiceResponse, Gather
+    from urllib3.util.retry import Retry
     TWILIO_AVAILABLE = True
 except ImportError:
     TWILIO_AVAILABLE = False
     TwilioClient = None
-    VoiceResponse = None
-    Gather = None
+    TwilioHttpClient = None
+
+try:
+    import redis.asyncio as aioredis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    aioredis = None
 
 try:
     from app.services.elevenlabs_service import ElevenLabsService, get_elevenlabs_service
@@ -32,6 +52,217 @@ except ImportError:
     ElevenLabsService = None
     get_elevenlabs_service = None
 
+# Content-addressed cache of synthesized call audio, keyed by sha256(voice_id, text).
+# Bytes are kept in a bounded in-process LRU so repeat scripts skip the
+# ElevenLabs round-trip entirely.
+_TTS_CACHE_MAX_ENTRIES = 512
+_tts_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_tts_cache_lock = threading.Lock()
+
+
+_NON_DIGIT = re.compile(r"\D+")
+_E164 = re.compile(r"^\+[1-9]\d{7,14}$")
+
+
+def _tts_cache_key(voice_id: str, text: str) -> str:
+    """Return the cache key for a voice and script."""
+    return hashlib.sha256(f"{voice_id}\0{text}".encode("utf-8")).hexdigest()
+
+
+def _pooled_twilio_http_client() -> TwilioHttpClient:
+    """Twilio HTTP client backed by a keep-alive session, so warm calls skip the TLS handshake."""
+    http_client = TwilioHttpClient()
+    session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=20,
+            pool_maxsize=50,
+            max_retries=Retry(total=2, backoff_factor=0.2),
+        ),
+    )
+    http_client.session = session
+    return http_client
+
+
+# TwiML is a fixed shape, so it is rendered from templates rather than built
+# with VoiceResponse/Gather; {text} and {action} are XML-escaped before formatting
+_TWIML_GATHER = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<Response>'
+    '<Gather action="{action}" input="speech dtmf" method="POST" numDigits="1" '
+    'speechTimeout="auto" timeout="{timeout}">'
+    '<Say language="en-US" voice="alice">{text}</Say>'
+    '</Gather>'
+    '<Say language="en-US" voice="alice">I didn\'t catch that. Let me continue.</Say>'
+    '<Redirect method="POST">{action}</Redirect>'
+    '</Response>'
+)
+_TWIML_SAY_AND_HANGUP = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<Response>'
+    '<Say language="en-US" voice="alice">{text}</Say>'
+    '<Say language="en-US" voice="alice">Thank you for your time and valuable feedback. Have a great day!</Say>'
+    '<Hangup />'
+    '</Response>'
+)
+_XML_ATTR_ENTITIES = {'"': "&quot;"}
+
+
+@functools.lru_cache(maxsize=2048)
+def _render_twiml(script_text: str, gather_input: bool, gather_timeout: int, webhook_base: str) -> str:
+    """Render TwiML for a call turn; memoized since campaigns reuse the same scripts."""
+    text = _xml_escape(script_text)
+
+    if gather_input and webhook_base:
+        # Single digit allowed for quick responses; if no input is received,
+        # say so and continue anyway
+        action = _xml_escape(f"{webhook_base}/phone-call/handle-input", _XML_ATTR_ENTITIES)
+        return _TWIML_GATHER.format(action=action, timeout=int(gather_timeout), text=text)
+
+    # Add a goodbye message only if ending
+    return _TWIML_SAY_AND_HANGUP.format(text=text)
+
+
+# Upper bound on how long call state is kept, refreshed on every write
+CALL_STATE_TTL = 3600
+
+
+class InMemoryCallStateStore:
+    """Per-process call state, used when REDIS_URL is not configured."""
+
+    def __init__(self):
+        self._calls: Dict[str, Dict[str, Any]] = {}
+
+    async def get(self, call_sid: str) -> Optional[Dict[str, Any]]:
+        """Return the stored state for a call, or None if unknown."""
+        state = self._calls.get(call_sid)
+        return dict(state) if state is not None else None
+
+    async def create(self, call_sid: str, state: Dict[str, Any]) -> bool:
+        """
+        Store the initial state for a call, keeping any fields already written
+        (e.g. by a status callback that arrived first); returns False if the
+        call already existed.
+        """
+        existing = self._calls.setdefault(call_sid, {})
+        created = not existing
+        for field, value in state.items():
+            existing.setdefault(field, value)
+        return created
+
+    async def update(self, call_sid: str, **fields: Any) -> bool:
+        """Update fields of an existing call; returns False if the call is unknown."""
+        state = self._calls.get(call_sid)
+        if state is None:
+            return False
+        state.update(fields)
+        return True
+
+    async def upsert(self, call_sid: str, **fields: Any) -> None:
+        """Update fields of a call, creating its state if it is unknown."""
+        self._calls.setdefault(call_sid, {}).update(fields)
+
+
+class RedisCallStateStore:
+    """
+    Call state shared by every worker/replica via a Redis hash per call.
+
+    Each top-level field is stored JSON-encoded under ``call:<sid>`` so that
+    webhook status updates can touch single fields without a read-modify-write.
+    """
+
+    # HSETNX every field + EXPIRE; returns 1 if the hash did not exist before
+    _CREATE_SCRIPT = """
+local created = redis.call('EXISTS', KEYS[1]) == 0
+for i = 2, #ARGV, 2 do
+    redis.call('HSETNX', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+if created then
+    return 1
+end
+return 0
+"""
+    # HSET + EXPIRE only if the hash still exists, so a concurrent expiry can't leave
+    # behind a partial hash holding just the updated fields
+    _UPDATE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+redis.call('HSET', KEYS[1], unpack(ARGV, 2))
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+    def __init__(self, client: "aioredis.Redis", ttl: int = CALL_STATE_TTL):
+        self.redis = client
+        self.ttl = ttl
+        self._create = client.register_script(self._CREATE_SCRIPT)
+        self._update = client.register_script(self._UPDATE_SCRIPT)
+
+    @staticmethod
+    def _key(call_sid: str) -> str:
+        return f"call:{call_sid}"
+
+    async def get(self, call_sid: str) -> Optional[Dict[str, Any]]:
+        """Return the stored state for a call, or None if unknown."""
+        raw = await self.redis.hgetall(self._key(call_sid))
+        if not raw:
+            return None
+        return {field: json.loads(value) for field, value in raw.items()}
+
+    async def create(self, call_sid: str, state: Dict[str, Any]) -> bool:
+        """
+        Store the initial state for a call, keeping any fields already written
+        (e.g. by a status callback that arrived first); returns False if the
+        call already existed.
+        """
+        if not state:
+            raise ValueError("Initial call state cannot be empty")
+        return bool(await self._create(keys=[self._key(call_sid)], args=self._script_args(state)))
+
+    async def update(self, call_sid: str, **fields: Any) -> bool:
+        """Update fields of an existing call; returns False if the call is unknown."""
+        key = self._key(call_sid)
+        if not fields:
+            return bool(await self.redis.exists(key))
+        return bool(await self._update(keys=[key], args=self._script_args(fields)))
+
+    async def upsert(self, call_sid: str, **fields: Any) -> None:
+        """Update fields of a call, creating its state if it is unknown."""
+        key = self._key(call_sid)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={field: json.dumps(value) for field, value in fields.items()})
+            pipe.expire(key, self.ttl)
+            await pipe.execute()
+
+    def _script_args(self, fields: Dict[str, Any]) -> list:
+        """Build ``[ttl, field, json, field, json, ...]`` for the create/update scripts."""
+        args: list = [self.ttl]
+        for field, value in fields.items():
+            args += (field, json.dumps(value))
+        return args
+
+
+@functools.lru_cache(maxsize=1)
+def get_call_state_store():
+    """
+    Get the process-wide call state store.
+
+    Uses Redis when REDIS_URL is set (required for multiple workers or
+    replicas), otherwise an in-process dictionary.
+    """
+    redis_url = os.getenv("REDIS_URL")
+    if redis_url:
+        if not REDIS_AVAILABLE:
+            raise ImportError(
+                "REDIS_URL is set but the redis package is not installed. Install it with: pip install redis"
+            )
+        return RedisCallStateStore(aioredis.Redis.from_url(redis_url, decode_responses=True))
+    return InMemoryCallStateStore()
+
+
 class CallStatus(str, Enum):
     """Call status enumeration."""
     INITIATED = "initiated"
@@ -43,6 +274,22 @@ class CallStatus(str, Enum):
     BUSY = "busy"
     CANCELED = "canceled"
 
+# Twilio call statuses (as sent by the API and status callbacks) -> CallStatus
+_TWILIO_STATUS_MAP = {
+    "queued": CallStatus.INITIATED,
+    "initiated": CallStatus.INITIATED,
+    "ringing": CallStatus.RINGING,
+    "in-progress": CallStatus.IN_PROGRESS,
+    "completed": CallStatus.COMPLETED,
+    "failed": CallStatus.FAILED,
+    "busy": CallStatus.BUSY,
+    "no-answer": CallStatus.NO_ANSWER,
+    "canceled": CallStatus.CANCELED,
+}
+
+# Status transitions Twilio pushes to the status callback
+_STATUS_CALLBACK_EVENTS = ["initiated", "ringing", "answered", "completed"]
+
 class PhoneCallService:
     """Service for making phone calls using Twilio and ElevenLabs TTS."""
 
@@ -77,7 +324,11 @@ class PhoneCallService:
                 "TWILIO_AUTH_TOKEN, and TWILIO_PHONE_NUMBER in your .env file."
             )
 
-        self.twilio_client = TwilioClient(self.twilio_account_sid, self.twilio_auth_token)
+        self.twilio_client = TwilioClient(
+            self.twilio_account_sid,
+            self.twilio_auth_token,
+            http_client=_pooled_twilio_http_client(),
+        )
         
         # ElevenLabs is optional - phone calls will work with Twilio's built-in TTS
         try:
@@ -86,13 +337,13 @@ class PhoneCallService:
             )
         except Exception as e:
             # If ElevenLabs fails to initialize, continue without it
-
+            logger.warning("ElevenLabs unavailable, using Twilio TTS: %s", e)
             self.elevenlabs_service = None
 
-        # Store active calls
-        self.active_calls: Dict[str, Dict[str, Any]] = {}
+        # Active call state (shared across workers when Redis is configured)
+        self.call_states = get_call_state_store()
 
-    def make_call(
+    async def make_call(
         self,
         to_phone_number: str,
         script_text: str,
@@ -102,6 +353,9 @@ class PhoneCallService:
         """
         Make a phone call using Twilio and ElevenLabs TTS.
 
+        ElevenLabs synthesis and Twilio call creation are independent, so both
+        blocking SDK calls run concurrently in worker threads.
+
         Args:
             to_phone_number: Phone number to call (E.164 format: +1234567890)
             script_text: Text script to convert to speech and play during call
@@ -115,61 +369,96 @@ class PhoneCallService:
             # Try to format phone number
             to_phone_number = self._format_phone_number(to_phone_number)
 
+        # Create TwiML for the call
+        # In production, you'd host this as a webhook endpoint
+        # For now, we'll use a simplified approach
+        # Twilio pushes status transitions to /phone-call/webhook, so status
+        # lookups are served from call state instead of polling the API
+        webhook_base = os.getenv("TWILIO_WEBHOOK_URL", "http://localhost:8000")
+        call_coro = asyncio.to_thread(
+            self.twilio_client.calls.create,
+            to=to_phone_number,
+            from_=self.twilio_phone_number,
+            url=webhook_url or self._generate_twiml_url(script_text),
+            method="POST",
+            status_callback=f"{webhook_base}/phone-call/webhook",
+            status_callback_event=_STATUS_CALLBACK_EVENTS,
+            status_callback_method="POST",
+        )
+
         # Generate audio from script using ElevenLabs
+        # For now, the call uses Twilio's <Say> verb with the text; in production
+        # you'd upload the audio to Twilio and use <Play>
+        coros = [call_coro]
         if self.elevenlabs_service:
-            try:
-                audio_bytes = self.elevenlabs_service.text_to_speech(
-                    text=script_text,
-                    voice_id=voice_id,
-                )
-                
-                # Save audio to temporary file or upload to Twilio
-                # For now, we'll use Twilio's <Say> verb with the text
-                # In production, you'd upload the audio to Twilio and use <Play>
-                use_audio_file = False  # Set to True if you upload audio to Twilio
-                
-            except Exception as e:
-
-                use_audio_file = False
-        else:
-            use_audio_file = False
-
-        # Make the call using Twilio
-        try:
-            # Create TwiML for the call
-            # In production, you'd host this as a webhook endpoint
-            # For now, we'll use a simplified approach
-            call = self.twilio_client.calls.create(
-                to=to_phone_number,
-                from_=self.twilio_phone_number,
-                url=webhook_url or self._generate_twiml_url(script_text),
-                method="POST",
-            )
+            coros.append(asyncio.to_thread(self._synthesize_cached, script_text, voice_id))
+        call, *audio = await asyncio.gather(*coros, return_exceptions=True)
+
+        # TTS failures are non-fatal; a failed call creation is not
+        if audio and isinstance(audio[0], BaseException):
+            logger.warning("ElevenLabs synthesis failed: %s", audio[0])
+        if isinstance(call, BaseException):
+            raise ValueError(f"Failed to make phone call: {str(call)}")
+
+        call_info = {
+            "call_sid": call.sid,
+            "status": call.status,
+            "to": to_phone_number,
+            "from": self.twilio_phone_number,
+            "script": script_text,
+            "created_at": call.date_created.isoformat() if call.date_created else None,
+        }
+
+        await self.call_states.create(call.sid, {
+            "call_info": call_info,
+            "script": script_text,
+            "status": CallStatus.INITIATED,
+        })
+
+        return call_info
+
+    def _synthesize_cached(self, text: str, voice_id: Optional[str] = None) -> bytes:
+        """
+        Return ElevenLabs audio for ``text``, reusing previously synthesized audio.
 
-            call_info = {
-                "call_sid": call.sid,
-                "status": call.status,
-                "to": to_phone_number,
-                "from": self.twilio_phone_number,
-                "script": script_text,
-                "created_at": call.date_created.isoformat() if call.date_created else None,
-            }
+        Args:
+            text: Script text to synthesize
+            voice_id: Optional ElevenLabs voice ID (defaults to the service's voice)
 
-            self.active_calls[call.sid] = {
-                "call_info": call_info,
-                "script": script_text,
-                "status": CallStatus.INITIATED,
-            }
+        Returns:
+            MP3 audio bytes
+        """
+        voice_id = voice_id or self.elevenlabs_service.default_voice_id
+        key = _tts_cache_key(voice_id, text)
 
-            return call_info
+        with _tts_cache_lock:
+            audio_bytes = _tts_cache.get(key)
+            if audio_bytes is not None:
+                _tts_cache.move_to_end(key)
+                return audio_bytes
 
-        except Exception as e:
-            raise ValueError(f"Failed to make phone call: {str(e)}")
+        audio_bytes = self.elevenlabs_service.text_to_speech(text=text, voice_id=voice_id)
+
+        with _tts_cache_lock:
+            _tts_cache[key] = audio_bytes
+            if len(_tts_cache) > _TTS_CACHE_MAX_ENTRIES:
+                _tts_cache.popitem(last=False)
+        return audio_bytes
+
+    @staticmethod
+    def clear_tts_cache() -> None:
+        """Drop all in-memory cached TTS audio."""
+        with _tts_cache_lock:
+            _tts_cache.clear()
 
     def _format_phone_number(self, phone_number: str) -> str:
         """Format phone number to E.164 format."""
+        # Already canonical - nothing to strip
+        if _E164.match(phone_number):
+            return phone_number
+
         # Remove all non-digit characters
-        digits = "".join(filter(str.isdigit, phone_number))
+        digits = _NON_DIGIT.sub("", phone_number)
         
         # Add country code if missing (assume US +1)
         if len(digits) == 10:
@@ -194,25 +483,34 @@ class PhoneCallService:
         # In production, you'd store this in a database or cache
         return f"{webhook_base}/phone-call/twiml"
 
-    def get_call_status(self, call_sid: str) -> Dict[str, Any]:
-        """Get the status of a call."""
-        try:
-            call = self.twilio_client.calls(call_sid).fetch()
-            
-            status_map = {
-                "queued": CallStatus.INITIATED,
-                "ringing": CallStatus.RINGING,
-                "in-progress": CallStatus.IN_PROGRESS,
-                "completed": CallStatus.COMPLETED,
-                "failed": CallStatus.FAILED,
-                "busy": CallStatus.BUSY,
-                "no-answer": CallStatus.NO_ANSWER,
-                "canceled": CallStatus.CANCELED,
+    async def get_call_status(self, call_sid: str) -> Dict[str, Any]:
+        """
+        Get the status of a call.
+
+        Served from call state kept current by Twilio's status callback; only
+        calls this deployment doesn't know about are fetched from Twilio.
+        """
+        state = await self.call_states.get(call_sid)
+        if state is not None:
+            call_info = state.get("call_info", {})
+            status = state.get("status")
+            return {
+                "call_sid": call_sid,
+                "status": _TWILIO_STATUS_MAP.get(status, status),
+                "duration": state.get("duration"),
+                "direction": state.get("direction"),
+                "to": call_info.get("to"),
+                "from": call_info.get("from"),
+                "start_time": call_info.get("created_at"),
+                "end_time": state.get("end_time"),
             }
 
+        try:
+            call = await asyncio.to_thread(self.twilio_client.calls(call_sid).fetch)
+
             return {
                 "call_sid": call.sid,
-                "status": status_map.get(call.status, call.status),
+                "status": _TWILIO_STATUS_MAP.get(call.status, call.status),
                 "duration": call.duration,
                 "direction": call.direction,
                 "to": call.to,
@@ -242,40 +540,18 @@ class PhoneCallService:
         Returns:
             TwiML XML string
         """
-        if not VoiceResponse:
-            raise ImportError("Twilio VoiceResponse not available")
-
         webhook_base = webhook_base or os.getenv("TWILIO_WEBHOOK_URL", "http://localhost:8000")
-        response = VoiceResponse()
-
-        if gather_input and webhook_base:
-            gather = Gather(
-                input="speech dtmf",
-                timeout=gather_timeout,
-                speech_timeout="auto",
-                action=f"{webhook_base}/phone-call/handle-input",
-                method="POST",
-                num_digits=1,  # Allow single digit for quick responses
-            )
-            gather.say(script_text, voice="alice", language="en-US")
-            response.append(gather)
-            
-            # If no input received, continue anyway
-            response.say("I didn't catch that. Let me continue.", voice="alice", language="en-US")
-            response.redirect(f"{webhook_base}/phone-call/handle-input", method="POST")
-        else:
-            response.say(script_text, voice="alice", language="en-US")
-            # Add a goodbye message only if ending
-            response.say("Thank you for your time and valuable feedback. Have a great day!", voice="alice", language="en-US")
-            response.hangup()
-
-        return str(response)
+        return _render_twiml(script_text, gather_input, gather_timeout, webhook_base)
 
+@functools.lru_cache(maxsize=1)
 def get_phone_call_service(
     elevenlabs_service: Optional[ElevenLabsService] = None,
 ) -> PhoneCallService:
     """
-    Get or create phone call service instance.
+    Get or create the process-wide phone call service instance.
+
+    The instance (and its pooled Twilio connection) is reused across requests;
+    a failed construction is not cached, so missing credentials are re-checked.
 
     Args:
         elevenlabs_service: Optional ElevenLabs service instance
@@ -1,7 +1,11 @@
 """Utility modules for the application."""
 
-from app.utils.data_normalization import normalize_metadata, normalize_customer_summary
+from app.utils.data_normalization import (
+    normalize_customer_summary,
+    normalize_metadata,
+    normalize_metadata_batch,
+)
 
-__all__ = ["normalize_metadata", "normalize_customer_summary"]
+__all__ = ["normalize_metadata", "normalize_metadata_batch", "normalize_customer_summary"]
 
 
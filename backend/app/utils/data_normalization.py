@@ -2,7 +2,82 @@
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Iterable
+
+
+# Float fields (monetary values, rates, scores)
+_FLOAT_FIELDS = frozenset({
+    "total_spent",
+    "lifetime_value",
+    "avg_order_value",
+    "churn_risk_score",
+    "satisfaction_score",
+    "email_open_rate",
+    "email_click_rate",
+    "sms_response_rate",
+    "video_completion_rate",
+    "repeat_purchase_rate",
+})
+
+# Integer fields (counts)
+_INT_FIELDS = frozenset({
+    "total_purchases",
+    "converted_campaigns",
+    "responded_to_campaigns",
+    "clicked_campaigns",
+    "referrals_made",
+    "app_downloads",
+    "store_visits",
+    "phone_calls",
+    "social_shares",
+    "loyalty_points",
+    "purchase_frequency_days",
+    "days_since_last_purchase",
+})
+
+# Boolean fields normalized to "Yes"/"No" strings where needed
+_BOOL_STRING_FIELDS = frozenset({
+    "newsletter_subscriber",
+    "push_notifications_enabled",
+    "social_media_follower",
+})
+
+_TRUE_STRS = frozenset({"true", "yes", "1"})
+_FALSE_STRS = frozenset({"false", "no", "0"})
+
+
+def _to_yes_no(value: Any) -> Any:
+    """Map booleans and boolean-like strings to "Yes"/"No"; leave anything else as-is."""
+    if isinstance(value, bool):
+        return "Yes" if value else "No"
+    if isinstance(value, str):
+        lowered = value.lower()
+        if lowered in _TRUE_STRS:
+            return "Yes"
+        if lowered in _FALSE_STRS:
+            return "No"
+    return value
+
+
+def _already_normalized(metadata: dict[str, Any]) -> bool:
+    """Return True if normalize_metadata would leave every value unchanged."""
+    for key, value in metadata.items():
+        if key in _FLOAT_FIELDS:
+            if value is not None and type(value) is not float:
+                return False
+        elif key in _INT_FIELDS:
+            if value is not None and type(value) is not int:
+                return False
+        elif key == "customer_id":
+            if type(value) is not str:
+                return False
+        elif key == "loyalty_member":
+            if value != "Yes" and value != "No":
+                return False
+        elif key in _BOOL_STRING_FIELDS:
+            if isinstance(value, bool) or _to_yes_no(value) != value:
+                return False
+    return True
 
 
 def normalize_metadata(metadata: dict[str, Any]) -> dict[str, Any]:
@@ -19,103 +94,65 @@ def normalize_metadata(metadata: dict[str, Any]) -> dict[str, Any]:
         metadata: Raw metadata dictionary from MongoDB
         
     Returns:
-        Normalized metadata with proper types
+        Normalized metadata with proper types. If ``metadata`` is already
+        normalized it is returned as-is (not copied), so callers must not
+        mutate the result.
     """
-    normalized = metadata.copy()
-    
-    # Float fields (monetary values, rates, scores)
-    float_fields = [
-        "total_spent",
-        "lifetime_value",
-        "avg_order_value",
-        "churn_risk_score",
-        "satisfaction_score",
-        "email_open_rate",
-        "email_click_rate",
-        "sms_response_rate",
-        "video_completion_rate",
-        "repeat_purchase_rate",
-    ]
-    
-    # Integer fields (counts)
-    int_fields = [
-        "total_purchases",
-        "converted_campaigns",
-        "responded_to_campaigns",
-        "clicked_campaigns",
-        "referrals_made",
-        "app_downloads",
-        "store_visits",
-        "phone_calls",
-        "social_shares",
-        "loyalty_points",
-        "purchase_frequency_days",
-        "days_since_last_purchase",
-    ]
-    
-    # Convert float fields
-    for field in float_fields:
-        if field in normalized:
-            value = normalized[field]
+    if _already_normalized(metadata):
+        return metadata
+
+    _float = float
+    _int = int
+    normalized: dict[str, Any] = {}
+
+    # Single pass over the metadata, dispatching on field name
+    for key, value in metadata.items():
+        if key in _FLOAT_FIELDS:
             if value is not None:
                 try:
-                    normalized[field] = float(value)
+                    value = _float(value)
                 except (ValueError, TypeError):
                     # If conversion fails, keep original value
                     pass
-    
-    # Convert integer fields
-    for field in int_fields:
-        if field in normalized:
-            value = normalized[field]
+        elif key in _INT_FIELDS:
             if value is not None:
                 try:
-                    normalized[field] = int(float(value))
+                    value = _int(_float(value))
                 except (ValueError, TypeError):
                     # If conversion fails, keep original value
                     pass
-    
-    # Normalize loyalty_member: Convert boolean to "Yes"/"No" string
-    if "loyalty_member" in normalized:
-        value = normalized["loyalty_member"]
-        if isinstance(value, bool):
-            normalized["loyalty_member"] = "Yes" if value else "No"
-        elif isinstance(value, str):
-            # Handle string booleans
-            if value.lower() in ["true", "yes", "1"]:
-                normalized["loyalty_member"] = "Yes"
-            elif value.lower() in ["false", "no", "0"]:
-                normalized["loyalty_member"] = "No"
-        elif value:
-            normalized["loyalty_member"] = "Yes"
-        else:
-            normalized["loyalty_member"] = "No"
-    
-    # Ensure customer_id is string
-    if "customer_id" in normalized:
-        normalized["customer_id"] = str(normalized["customer_id"])
-    
-    # Normalize boolean fields to strings where needed
-    boolean_string_fields = [
-        "newsletter_subscriber",
-        "push_notifications_enabled",
-        "social_media_follower",
-    ]
-    
-    for field in boolean_string_fields:
-        if field in normalized:
-            value = normalized[field]
-            if isinstance(value, bool):
-                normalized[field] = "Yes" if value else "No"
-            elif isinstance(value, str):
-                if value.lower() in ["true", "yes", "1"]:
-                    normalized[field] = "Yes"
-                elif value.lower() in ["false", "no", "0"]:
-                    normalized[field] = "No"
-    
+        elif key == "customer_id":
+            value = str(value)
+        elif key == "loyalty_member":
+            # Non-string values fall back to truthiness
+            if isinstance(value, (bool, str)):
+                value = _to_yes_no(value)
+            else:
+                value = "Yes" if value else "No"
+        elif key in _BOOL_STRING_FIELDS:
+            value = _to_yes_no(value)
+        normalized[key] = value
+
     return normalized
 
 
+def normalize_metadata_batch(records: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Normalize a batch of metadata dictionaries (e.g. for list endpoints).
+
+    Empty or missing metadata normalizes to ``{}``. Results follow the same
+    aliasing rule as :func:`normalize_metadata`.
+
+    Args:
+        records: Raw metadata dictionaries
+        
+    Returns:
+        Normalized metadata, in input order
+    """
+    normalize = normalize_metadata
+    return [normalize(metadata) if metadata else {} for metadata in records]
+
+
 def normalize_customer_summary(metadata: dict[str, Any]) -> dict[str, Any]:
     """
     Create a normalized customer summary from metadata.
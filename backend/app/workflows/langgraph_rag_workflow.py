@@ -2,8 +2,16 @@
 
 from __future__ import annotations
 
-from typing import Any, Optional, TypedDict
-
+import asyncio
+import functools
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Optional, TypedDict
+
+from langchain.prompts import PromptTemplate
 from langchain_core.documents import Document
 from langgraph.graph import StateGraph, END
 from langgraph.prebuilt import ToolNode
@@ -12,6 +20,84 @@ from langgraph.checkpoint.memory import MemorySaver
 from app.services.langchain_rag_service import LangChainRAGService
 from app.services.memmachine_client import MemMachineMCPClient
 
+logger = logging.getLogger(__name__)
+
+_ANSWER_PROMPT = PromptTemplate(
+    template="""Use the following context to answer the question. If you don't know the answer, say so.
+
+Context:
+{context}
+
+Question: {question}
+
+Answer:""",
+    input_variables=["context", "question"],
+)
+
+# Per-run token callback; a context variable so it reaches the graph node
+# without going through (checkpointed) graph state
+_stream_callback: ContextVar[Optional[Callable[[str], Awaitable[None]]]] = ContextVar(
+    "_stream_callback", default=None
+)
+
+DOCUMENT_CACHE_MAX_ENTRIES = 256
+DOCUMENT_CACHE_TTL = 300.0
+
+
+# (store identity and write version, query digest, k)
+_DocumentCacheKey = tuple[tuple[str, str, int], bytes, int]
+
+
+class _DocumentCache:
+    """LRU cache with per-entry TTL for vector-store search results.
+
+    Only touched from the event loop, so no locking is needed.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[_DocumentCacheKey, tuple[float, list[Document]]] = OrderedDict()
+
+    def get(self, key: _DocumentCacheKey) -> Optional[list[Document]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, documents = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return documents
+
+    def put(self, key: _DocumentCacheKey, documents: list[Document]) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, documents)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+# Shared across workflow instances, which are created per request
+_document_cache = _DocumentCache(DOCUMENT_CACHE_MAX_ENTRIES, DOCUMENT_CACHE_TTL)
+
+
+def _memory_text(memory: Any) -> str:
+    """Extract the text of a MemMachine search hit ("" if it has none)."""
+    if isinstance(memory, str):
+        return memory
+    if isinstance(memory, dict):
+        return memory.get("content") or memory.get("text") or ""
+    return ""
+
+
+def _preview(doc: Document, max_chars: int = 200) -> dict[str, Any]:
+    """Serialize a document with its content truncated to ``max_chars``."""
+    content = doc.page_content
+    if len(content) > max_chars:
+        content = content[:max_chars] + "..."
+    return {"content": content, "metadata": doc.metadata}
+
+
 class RAGState(TypedDict):
     """State for RAG workflow."""
 
@@ -47,16 +133,14 @@ class LangGraphRAGWorkflow:
         """Build the LangGraph workflow."""
         workflow = StateGraph(RAGState)
 
-        # Add nodes - note: LangGraph handles sync/async mixing
-        workflow.add_node("retrieve_documents", self._retrieve_documents)
-        workflow.add_node("retrieve_memories", self._retrieve_memories_wrapper)
+        # Add nodes - LangGraph awaits async nodes and runs sync ones directly
+        workflow.add_node("retrieve", self._retrieve)
         workflow.add_node("combine_context", self._combine_context)
         workflow.add_node("generate_answer", self._generate_answer)
 
         # Define edges
-        workflow.set_entry_point("retrieve_documents")
-        workflow.add_edge("retrieve_documents", "retrieve_memories")
-        workflow.add_edge("retrieve_memories", "combine_context")
+        workflow.set_entry_point("retrieve")
+        workflow.add_edge("retrieve", "combine_context")
         workflow.add_edge("combine_context", "generate_answer")
         workflow.add_edge("generate_answer", END)
 
@@ -64,43 +148,45 @@ class LangGraphRAGWorkflow:
         memory = MemorySaver()
         return workflow.compile(checkpointer=memory)
 
-    def _retrieve_documents(self, state: RAGState) -> RAGState:
-        """Retrieve documents from vector store."""
+    async def _retrieve(self, state: RAGState) -> RAGState:
+        """Retrieve documents and memories concurrently."""
         query = state["query"]
-        k = state.get("k", 5)
 
-        documents = self.rag_service.search_documents(query, k=k)
+        documents, memories = await asyncio.gather(
+            self._retrieve_documents(query, state.get("k", 5)),
+            self._retrieve_memories(query, state.get("user_id")),
+        )
         state["documents"] = documents
+        state["memories"] = memories
 
         return state
 
-    def _retrieve_memories_wrapper(self, state: RAGState) -> RAGState:
-        """Wrapper for async memory retrieval (sync wrapper for LangGraph)."""
-        import asyncio
+    async def _retrieve_documents(self, query: str, k: int) -> list[Document]:
+        """Retrieve documents from vector store, reusing recent results for the same query.
 
-        # Run async function in sync context
-        try:
-            loop = asyncio.get_event_loop()
-        except RuntimeError:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-
-        if loop.is_running():
-            # If loop is running, we need to use a different approach
-            # For now, skip memories if we can't run async
-            state["memories"] = []
-            return state
-
-        return loop.run_until_complete(self._retrieve_memories(state))
-
-    async def _retrieve_memories(self, state: RAGState) -> RAGState:
+        The cache key includes the service's store identity and its write version,
+        which is kept in MongoDB. Results therefore never leak between databases,
+        and a store or delete on any worker makes earlier results unreachable.
+        """
+        # Read before searching: a write that lands mid-search bumps the version
+        # past the key this (possibly pre-write) result is cached under
+        store_key = await asyncio.to_thread(self.rag_service.get_store_key)
+        key = (
+            store_key,
+            hashlib.blake2b(query.encode("utf-8"), digest_size=16).digest(),
+            k,
+        )
+        documents = _document_cache.get(key)
+        if documents is None:
+            # Vector search is sync, so it runs in a worker thread alongside MemMachine
+            documents = await asyncio.to_thread(self.rag_service.search_documents, query, k=k)
+            _document_cache.put(key, documents)
+        return list(documents)
+
+    async def _retrieve_memories(self, query: str, user_id: Optional[str]) -> list[Document]:
         """Retrieve memories from MemMachine."""
         if not self.memmachine_client:
-            state["memories"] = []
-            return state
-
-        query = state["query"]
-        user_id = state.get("user_id")
+            return []
 
         try:
             memory_results = await self.memmachine_client.search_memory(
@@ -110,43 +196,25 @@ class LangGraphRAGWorkflow:
             )
 
             # Parse memory results
-            memories = []
             if isinstance(memory_results, dict):
-                if "memories" in memory_results:
-                    memory_list = memory_results["memories"]
-                elif "results" in memory_results:
-                    memory_list = memory_results["results"]
-                else:
-                    memory_list = []
+                memory_list = memory_results.get("memories") or memory_results.get("results") or []
             elif isinstance(memory_results, list):
                 memory_list = memory_results
             else:
                 memory_list = []
 
-            # Convert to Document format
-            for memory in memory_list:
-                if isinstance(memory, dict):
-                    content = memory.get("content", memory.get("text", str(memory)))
-                elif isinstance(memory, str):
-                    content = memory
-                else:
-                    continue
-
-                # Skip document memories (already in documents)
-                if not content.startswith("[Document"):
-                    memories.append(
-                        Document(
-                            page_content=content,
-                            metadata={"type": "memory", "source": "memmachine"},
-                        )
-                    )
-
-            state["memories"] = memories
+            # Convert to Document format, skipping document memories (already in documents)
+            texts = (_memory_text(memory) for memory in memory_list)
+            memories = [
+                Document(page_content=text, metadata={"type": "memory", "source": "memmachine"})
+                for text in texts
+                if text and not text.startswith("[Document")
+            ]
         except Exception as e:
+            logger.warning("Failed to retrieve memories: %s", e)
+            return []
 
-            state["memories"] = []
-
-        return state
+        return memories
 
     def _combine_context(self, state: RAGState) -> RAGState:
         """Combine documents and memories into context."""
@@ -175,10 +243,13 @@ class LangGraphRAGWorkflow:
 
         return state
 
-    def _generate_answer(self, state: RAGState) -> RAGState:
-        """Generate answer using LLM."""
-        from langchain.prompts import PromptTemplate
+    @functools.cached_property
+    def _answer_chain(self):
+        """Prompt | LLM chain, built on first use since the LLM is created lazily."""
+        return _ANSWER_PROMPT | self.rag_service.llm
 
+    async def _generate_answer(self, state: RAGState) -> RAGState:
+        """Generate answer using LLM."""
         query = state["query"]
         context = state.get("context", "")
 
@@ -186,32 +257,18 @@ class LangGraphRAGWorkflow:
             state["answer"] = "No relevant context found."
             return state
 
-        # Create prompt
-        prompt_template = """Use the following context to answer the question. If you don't know the answer, say so.
-
-Context:
-{context}
-
-Question: {question}
-
-Answer:"""
-
-        prompt = PromptTemplate(
-            template=prompt_template,
-            input_variables=["context", "question"],
-        )
-
-        # Generate answer
-        chain = prompt | self.rag_service.llm
-        answer = chain.invoke({"context": context, "question": query})
-
-        # Extract answer text
-        if hasattr(answer, "content"):
-            answer_text = answer.content
-        else:
-            answer_text = str(answer)
+        # Stream the answer, forwarding each chunk as it arrives
+        stream_callback = _stream_callback.get()
+        answer_parts: list[str] = []
+        async for chunk in self._answer_chain.astream({"context": context, "question": query}):
+            text = chunk.content if hasattr(chunk, "content") else str(chunk)
+            if not text:
+                continue
+            answer_parts.append(text)
+            if stream_callback is not None:
+                await stream_callback(text)
 
-        state["answer"] = answer_text
+        state["answer"] = "".join(answer_parts)
 
         return state
 
@@ -221,6 +278,7 @@ Answer:"""
         k: int = 5,
         user_id: Optional[str] = None,
         config: Optional[dict[str, Any]] = None,
+        stream_callback: Optional[Callable[[str], Awaitable[None]]] = None,
     ) -> dict[str, Any]:
         """
         Run the RAG workflow.
@@ -230,6 +288,7 @@ Answer:"""
             k: Number of documents to retrieve
             user_id: User ID for MemMachine
             config: Optional LangGraph config
+            stream_callback: Optional coroutine called with each answer chunk as it is generated
 
         Returns:
             Dictionary with answer and sources
@@ -246,32 +305,19 @@ Answer:"""
         }
 
         config = config or {}
-        # LangGraph graphs are synchronous by default, but we can use ainvoke for async
+        # The graph contains async nodes, so it must be driven with ainvoke
+        token = _stream_callback.set(stream_callback)
         try:
             result = await self.graph.ainvoke(initial_state, config=config)
-        except AttributeError:
-            # Fallback to sync invocation if ainvoke is not available
-            import asyncio
-            result = await asyncio.to_thread(self.graph.invoke, initial_state, config)
+        finally:
+            _stream_callback.reset(token)
 
         return {
             "query": query,
             "answer": result.get("answer"),
             "sources": result.get("sources", []),
-            "documents": [
-                {
-                    "content": doc.page_content[:200] + "..." if len(doc.page_content) > 200 else doc.page_content,
-                    "metadata": doc.metadata,
-                }
-                for doc in result.get("documents", [])
-            ],
-            "memories": [
-                {
-                    "content": mem.page_content[:200] + "..." if len(mem.page_content) > 200 else mem.page_content,
-                    "metadata": mem.metadata,
-                }
-                for mem in result.get("memories", [])
-            ],
+            "documents": [_preview(doc) for doc in result.get("documents", [])],
+            "memories": [_preview(mem) for mem in result.get("memories", [])],
             "total_context": len(result.get("documents", [])) + len(result.get("memories", [])),
         }
 
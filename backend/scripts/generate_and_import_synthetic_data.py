@@ -5,22 +5,71 @@ Generate and import synthetic data to MongoDB.
 - Searchable text → RAG chunks collection (for vector search)
 """
 
+import gzip
 import json
 import os
+import queue
 import random
 import sys
-from datetime import datetime, timedelta
+import threading
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
 from pathlib import Path
-from typing import Any
+from itertools import islice
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence
 
+import numpy as np
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Load environment variables
 load_dotenv(Path(__file__).parent.parent / ".env")
 
 API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:8000")
 
+# Each POST is embedded server-side in one call: mid-sized batches keep that call short,
+# and a handful of requests in flight saturates the embedding API without piling up
+RAG_UPLOAD_BATCH_SIZE = int(os.getenv("RAG_UPLOAD_BATCH_SIZE", "64"))
+RAG_UPLOAD_WORKERS = int(os.getenv("RAG_UPLOAD_WORKERS", "4"))
+# Bodies at least this large are gzip-compressed; below it the gzip overhead outweighs the savings
+RAG_UPLOAD_GZIP_MIN_BYTES = 16 * 1024
+
+# One keep-alive session for all uploads; every request goes to API_BASE_URL, so a
+# single host pool holding one connection per upload worker is enough (a smaller
+# pool would close and reopen connections).
+# Uploads are POSTs that store documents, so they are only retried when the server
+# provably did not process them: connection failures and 429/503 responses (honoring
+# Retry-After). A lost response (read error) or a 500/502/504 may follow a partial
+# write and is reported rather than re-sent. Up to 5 retries back off 0s, 1s, 2s, 4s
+# and 8s; once they run out the last response is returned so its status and detail
+# get reported.
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=RAG_UPLOAD_WORKERS,
+    max_retries=Retry(
+        total=5,
+        read=0,
+        backoff_factor=0.5,
+        status_forcelist=[429, 503],
+        allowed_methods=frozenset({"POST"}),
+        raise_on_status=False,
+    ),
+)
+SESSION.mount("http://", _adapter)
+SESSION.mount("https://", _adapter)
+
+try:  # orjson serializes the large upload bodies several times faster than stdlib json
+    import orjson
+
+    _json_dumps = orjson.dumps
+except ImportError:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
 # Try to import Faker, use fallback if not available
 try:
     from faker import Faker
@@ -40,202 +89,333 @@ NUM_CAMPAIGNS = 50
 NUM_FAQS = 100
 NUM_FEEDBACK = 300
 
+# Transactions and orders are generated and inserted this many records at a time
+GENERATION_CHUNK_SIZE = 1000
+
 # Customer segments
 CUSTOMER_SEGMENTS = ["Premium", "Regular", "Casual", "VIP"]
 PRODUCT_CATEGORIES = ["Espresso", "Latte", "Cappuccino", "Iced Coffee", "Tea", "Pastry", "Sandwich"]
 PAYMENT_METHODS = ["Credit Card", "Debit Card", "Cash", "Mobile Payment"]
 CAMPAIGN_TYPES = ["Discount", "Buy One Get One", "Loyalty Points", "Seasonal"]
 CAMPAIGN_STATUSES = ["active", "completed", "scheduled"]
+PRODUCT_NAMES = {
+    "Espresso": ["Single Espresso", "Double Espresso", "Americano", "Macchiato"],
+    "Latte": ["Vanilla Latte", "Caramel Latte", "Hazelnut Latte", "Classic Latte"],
+    "Cappuccino": ["Regular Cappuccino", "Vanilla Cappuccino", "Chocolate Cappuccino"],
+    "Iced Coffee": ["Iced Americano", "Iced Latte", "Cold Brew", "Iced Espresso"],
+    "Tea": ["Green Tea", "Black Tea", "Herbal Tea", "Chai Latte"],
+    "Pastry": ["Croissant", "Muffin", "Bagel", "Donut"],
+    "Sandwich": ["Breakfast Sandwich", "Turkey Sandwich", "Veggie Sandwich"]
+}
+# Name arrays aligned with PRODUCT_CATEGORIES indices for the bulk draws in generate_products
+PRODUCT_NAME_ARRAYS = [np.asarray(PRODUCT_NAMES.get(category, ["Product"]), dtype=object) for category in PRODUCT_CATEGORIES]
+CATEGORY_INDEX = {category: i for i, category in enumerate(PRODUCT_CATEGORIES)}
+# Extra product-description sentences for the categories that have them
+CATEGORY_BLURBS = {
+    "Espresso": "with a rich, bold flavor and notes of chocolate and caramel. Perfect for coffee enthusiasts who enjoy a strong, aromatic coffee experience",
+    "Latte": "with a smooth, creamy texture and sweet flavor. Ideal for those who prefer a milder coffee taste",
+    "Iced Coffee": "refreshing and perfect for hot days. Made with premium coffee beans and served over ice",
+    "Pastry": "freshly baked daily. Perfect pairing with coffee or tea",
+}
+EMAIL_DOMAINS = ["email.com", "example.com", "test.com", "mail.com"]
 
+# Every customer record shares this keyset (and key order); copying a skeleton is
+# cheaper than building a 35-key dict literal per record
+_CUSTOMER_TEMPLATE = dict.fromkeys([
+    "customer_id", "first_name", "last_name", "email", "phone", "customer_segment",
+    "loyalty_member", "loyalty_points", "total_purchases", "total_spent", "avg_order_value",
+    "lifetime_value", "churn_risk_score", "first_purchase_date", "last_purchase_date",
+    "days_since_last_purchase", "preferred_category", "favorite_product_category",
+    "preferred_contact_method", "visit_frequency", "preferred_time", "responded_to_campaigns",
+    "clicked_campaigns", "converted_campaigns", "email_open_rate", "email_click_rate",
+    "sms_response_rate", "social_shares", "video_completion_rate", "app_downloads", "store_visits",
+    "satisfaction_score", "referrals_made", "repeat_purchase_rate", "created_at", "updated_at",
+])
 
-def get_fake_name() -> tuple[str, str]:
-    """Get fake name, with fallback if Faker is not available."""
-    if FAKER_AVAILABLE:
-        return fake.first_name(), fake.last_name()
-    first_names = ["John", "Jane", "Bob", "Alice", "Charlie", "Diana", "Eve", "Frank", "Grace", "Henry"]
-    last_names = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez"]
-    return random.choice(first_names), random.choice(last_names)
+# Fallback vocabularies used when Faker is not installed
+FALLBACK_FIRST_NAMES = ["John", "Jane", "Bob", "Alice", "Charlie", "Diana", "Eve", "Frank", "Grace", "Henry"]
+FALLBACK_LAST_NAMES = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez"]
+FALLBACK_COMPANIES = ["Coffee Beans Co.", "Premium Roasters", "Bean Supply Inc.", "Roast Masters"]
 
-def get_fake_email(first_name: str, last_name: str) -> str:
-    """Get fake email, with fallback if Faker is not available."""
-    if FAKER_AVAILABLE:
-        return fake.email()
-    domains = ["email.com", "example.com", "test.com", "mail.com"]
-    return f"{first_name.lower()}.{last_name.lower()}@{random.choice(domains)}"
+# Shared generator for the vectorized (per-column) draws below
+rng = np.random.default_rng()
 
-def get_fake_phone() -> str:
-    """Get fake phone, with fallback if Faker is not available."""
-    if FAKER_AVAILABLE:
-        return fake.phone_number()
-    return f"+1-555-{random.randint(1000, 9999)}"
 
-def get_fake_company() -> str:
-    """Get fake company, with fallback if Faker is not available."""
-    if FAKER_AVAILABLE:
-        return fake.company()
-    companies = ["Coffee Beans Co.", "Premium Roasters", "Bean Supply Inc.", "Roast Masters"]
-    return random.choice(companies)
+def choose(options: Sequence[Any], size: int) -> list:
+    """Draw ``size`` items uniformly from ``options`` in one vectorized call."""
+    return np.asarray(options, dtype=object)[rng.integers(0, len(options), size)].tolist()
+
+
+def days_before(now: datetime, days: np.ndarray) -> list[str]:
+    """ISO timestamps ``days`` whole days before ``now``, computed as one array op."""
+    return (np.datetime64(now, "us") - days.astype("timedelta64[D]")).astype(str).tolist()
+
+
+def email_local_part(name: str) -> str:
+    """Reduce a name to lowercase ASCII letters and digits ("O'Connor" -> "oconnor", "José" -> "jose")."""
+    ascii_name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    return "".join(ch for ch in ascii_name.lower() if ch.isalnum()) or "customer"
+
+
+def tally_categories(category_counts: Optional[np.ndarray], customer_idx: Any, category_idx: Any, quantities: Any):
+    """Scatter-add purchase quantities into a customers x PRODUCT_CATEGORIES count matrix."""
+    if category_counts is not None:
+        np.add.at(
+            category_counts,
+            (np.asarray(customer_idx, dtype=np.intp), np.asarray(category_idx, dtype=np.intp)),
+            quantities,
+        )
+
 
 def generate_customers(count: int) -> list[dict[str, Any]]:
     """Generate synthetic customer data with all fields needed for frontend."""
+    now = datetime.now()
+    now_iso = now.isoformat()
+
+    # Draw every random column at once; derived fields are array arithmetic
+    segments = choose(CUSTOMER_SEGMENTS, count)
+    loyalty_member = rng.random(count) < 0.5
+    loyalty_points = np.where(loyalty_member, rng.integers(0, 5001, count), 0)
+    total_purchases = rng.integers(5, 101, count)
+    avg_order_value = rng.uniform(15.0, 50.0, count).round(2)
+    total_spent = (total_purchases * avg_order_value).round(2)
+    lifetime_value = (total_spent * rng.uniform(1.1, 1.5, count)).round(2)  # LTV is typically higher than total spent
+    days_since_last_purchase = rng.integers(0, 91, count)
+    # Churn risk rises with days since the last purchase: high (>60), medium (>30), low
+    churn_base = rng.random(count)
+    churn_risk_score = np.select(
+        [days_since_last_purchase > 60, days_since_last_purchase > 30],
+        [0.6 + churn_base * 0.3, 0.3 + churn_base * 0.3],
+        0.1 + churn_base * 0.2,
+    ).round(2)
+    first_purchase_dates = days_before(now, rng.integers(30, 366, count))
+    last_purchase_dates = days_before(now, rng.integers(0, 31, count))
+
+    # Generate campaign engagement metrics
+    responded_to_campaigns = rng.integers(0, np.minimum(total_purchases, 20) + 1)
+    converted_campaigns = rng.integers(0, (responded_to_campaigns * 0.3).astype(np.int64) + 1)  # 30% conversion rate
+
+    email_open_rate = rng.uniform(15.0, 45.0, count).round(1)  # 15-45% open rate
+    email_click_rate = rng.uniform(2.0, 8.0, count).round(1)   # 2-8% click rate
+    sms_response_rate = rng.uniform(10.0, 25.0, count).round(1)  # 10-25% SMS response
+    satisfaction_score = rng.uniform(3.5, 5.0, count).round(1)  # 3.5-5.0 out of 5
+    social_shares = rng.integers(0, 11, count)
+    video_completion_rate = rng.uniform(40.0, 80.0, count).round(1)
+    app_downloads = rng.integers(0, 4, count)
+    store_visits = rng.integers(total_purchases, total_purchases + 21)
+    referrals_made = rng.integers(0, 6, count)
+    repeat_purchase_rate = rng.uniform(40.0, 80.0, count).round(1)
+    preferred_category = choose(PRODUCT_CATEGORIES, count)  # Will be updated based on orders
+    favorite_product_category = choose(PRODUCT_CATEGORIES, count)  # Will be updated based on orders
+    visit_frequency = choose(["Daily", "3-4 times per week", "Weekly", "Monthly", "Occasional"], count)
+    preferred_time = choose(["Morning", "Afternoon", "Evening", "Anytime"], count)
+
+    # Identity columns: one batched pass per Faker provider, or bulk draws from the fallback vocabularies
+    if FAKER_AVAILABLE:
+        first_names = [fake.first_name() for _ in range(count)]
+        last_names = [fake.last_name() for _ in range(count)]
+        phones = [fake.phone_number() for _ in range(count)]
+    else:
+        first_names = choose(FALLBACK_FIRST_NAMES, count)
+        last_names = choose(FALLBACK_LAST_NAMES, count)
+        phones = [f"+1-555-{number}" for number in rng.integers(1000, 10000, count).tolist()]
+    # Emails only need to look plausible, so compose them from the names instead of calling Faker;
+    # names are reduced to ASCII alphanumerics so spaces, apostrophes and accents stay valid
+    emails = [
+        f"{email_local_part(first)}.{email_local_part(last)}@{domain}"
+        for first, last, domain in zip(first_names, last_names, choose(EMAIL_DOMAINS, count))
+    ]
+
+    # Convert to Python scalars once (NumPy scalars are not BSON-encodable)
+    (
+        loyalty_member, loyalty_points, total_purchases, avg_order_value, total_spent, lifetime_value,
+        churn_risk_score, days_since_last_purchase, responded_to_campaigns,
+        converted_campaigns, email_open_rate, email_click_rate, sms_response_rate, satisfaction_score,
+        social_shares, video_completion_rate, app_downloads, store_visits, referrals_made, repeat_purchase_rate,
+    ) = (
+        column.tolist() for column in (
+            loyalty_member, loyalty_points, total_purchases, avg_order_value, total_spent, lifetime_value,
+            churn_risk_score, days_since_last_purchase, responded_to_campaigns,
+            converted_campaigns, email_open_rate, email_click_rate, sms_response_rate, satisfaction_score,
+            social_shares, video_completion_rate, app_downloads, store_visits, referrals_made, repeat_purchase_rate,
+        )
+    )
+
+    template = {**_CUSTOMER_TEMPLATE, "created_at": now_iso, "updated_at": now_iso}
     customers = []
-    for i in range(1, count + 1):
-        customer_id = f"C{i:04d}"
-        segment = random.choice(CUSTOMER_SEGMENTS)
-        loyalty_member = random.choice([True, False])
-        total_purchases = random.randint(5, 100)
-        avg_order_value = round(random.uniform(15.0, 50.0), 2)
-        total_spent = round(total_purchases * avg_order_value, 2)
-        lifetime_value = round(total_spent * random.uniform(1.1, 1.5), 2)  # LTV is typically higher than total spent
-        
-        first_name, last_name = get_fake_name()
-        phone_number = get_fake_phone()
-        
-        # Calculate churn risk based on customer behavior
-        days_since_last_purchase = random.randint(0, 90)
-        if days_since_last_purchase > 60:
-            churn_risk_score = round(random.uniform(0.6, 0.9), 2)  # High churn risk
-        elif days_since_last_purchase > 30:
-            churn_risk_score = round(random.uniform(0.3, 0.6), 2)  # Medium churn risk
-        else:
-            churn_risk_score = round(random.uniform(0.1, 0.3), 2)  # Low churn risk
-        
-        # Generate campaign engagement metrics
-        responded_to_campaigns = random.randint(0, min(total_purchases, 20))
-        converted_campaigns = random.randint(0, int(responded_to_campaigns * 0.3))  # 30% conversion rate
-        
-        # Email engagement metrics
-        email_open_rate = round(random.uniform(15.0, 45.0), 1)  # 15-45% open rate
-        email_click_rate = round(random.uniform(2.0, 8.0), 1)   # 2-8% click rate
-        
-        # SMS response rate
-        sms_response_rate = round(random.uniform(10.0, 25.0), 1)  # 10-25% SMS response
-        
-        # Satisfaction score
-        satisfaction_score = round(random.uniform(3.5, 5.0), 1)  # 3.5-5.0 out of 5
-        
-        customers.append({
-            "customer_id": customer_id,
-            "first_name": first_name,
-            "last_name": last_name,
-            "email": get_fake_email(first_name, last_name),
-            "phone": phone_number,
-            "customer_segment": segment,
-            "loyalty_member": loyalty_member,
-            "loyalty_points": random.randint(0, 5000) if loyalty_member else 0,
-            "total_purchases": total_purchases,
-            "total_spent": total_spent,
-            "avg_order_value": avg_order_value,
-            "lifetime_value": lifetime_value,
-            "churn_risk_score": churn_risk_score,
-            "first_purchase_date": (datetime.now() - timedelta(days=random.randint(30, 365))).isoformat(),
-            "last_purchase_date": (datetime.now() - timedelta(days=random.randint(0, 30))).isoformat(),
-            "days_since_last_purchase": days_since_last_purchase,
-            "preferred_category": random.choice(PRODUCT_CATEGORIES),  # Will be updated based on orders
-            "favorite_product_category": random.choice(PRODUCT_CATEGORIES),  # Will be updated based on orders
-            "preferred_contact_method": phone_number,  # Phone number as preferred contact method
-            "visit_frequency": random.choice(["Daily", "3-4 times per week", "Weekly", "Monthly", "Occasional"]),
-            "preferred_time": random.choice(["Morning", "Afternoon", "Evening", "Anytime"]),
-            # Campaign engagement metrics
-            "responded_to_campaigns": responded_to_campaigns,
-            "clicked_campaigns": responded_to_campaigns,  # Assume all responders clicked
-            "converted_campaigns": converted_campaigns,
-            # Email metrics
-            "email_open_rate": email_open_rate,
-            "email_click_rate": email_click_rate,
-            # SMS metrics
-            "sms_response_rate": sms_response_rate,
-            # Social media metrics
-            "social_shares": random.randint(0, 10),
-            "video_completion_rate": round(random.uniform(40.0, 80.0), 1),
-            "app_downloads": random.randint(0, 3),
-            "store_visits": random.randint(total_purchases, total_purchases + 20),
-            # Other metrics
-            "satisfaction_score": satisfaction_score,
-            "referrals_made": random.randint(0, 5),
-            "repeat_purchase_rate": round(random.uniform(40.0, 80.0), 1),
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
-        })
+    for i in range(count):
+        phone_number = phones[i]
+        customer = template.copy()
+        customer["customer_id"] = f"C{i + 1:04d}"
+        customer["first_name"] = first_names[i]
+        customer["last_name"] = last_names[i]
+        customer["email"] = emails[i]
+        customer["phone"] = phone_number
+        customer["customer_segment"] = segments[i]
+        customer["loyalty_member"] = loyalty_member[i]
+        customer["loyalty_points"] = loyalty_points[i]
+        customer["total_purchases"] = total_purchases[i]
+        customer["total_spent"] = total_spent[i]
+        customer["avg_order_value"] = avg_order_value[i]
+        customer["lifetime_value"] = lifetime_value[i]
+        customer["churn_risk_score"] = churn_risk_score[i]
+        customer["first_purchase_date"] = first_purchase_dates[i]
+        customer["last_purchase_date"] = last_purchase_dates[i]
+        customer["days_since_last_purchase"] = days_since_last_purchase[i]
+        customer["preferred_category"] = preferred_category[i]
+        customer["favorite_product_category"] = favorite_product_category[i]
+        customer["preferred_contact_method"] = phone_number  # Phone number as preferred contact method
+        customer["visit_frequency"] = visit_frequency[i]
+        customer["preferred_time"] = preferred_time[i]
+        # Campaign engagement metrics
+        customer["responded_to_campaigns"] = responded_to_campaigns[i]
+        customer["clicked_campaigns"] = responded_to_campaigns[i]  # Assume all responders clicked
+        customer["converted_campaigns"] = converted_campaigns[i]
+        # Email metrics
+        customer["email_open_rate"] = email_open_rate[i]
+        customer["email_click_rate"] = email_click_rate[i]
+        # SMS metrics
+        customer["sms_response_rate"] = sms_response_rate[i]
+        # Social media metrics
+        customer["social_shares"] = social_shares[i]
+        customer["video_completion_rate"] = video_completion_rate[i]
+        customer["app_downloads"] = app_downloads[i]
+        customer["store_visits"] = store_visits[i]
+        # Other metrics
+        customer["satisfaction_score"] = satisfaction_score[i]
+        customer["referrals_made"] = referrals_made[i]
+        customer["repeat_purchase_rate"] = repeat_purchase_rate[i]
+        customers.append(customer)
     return customers
 
 
 def generate_products(count: int) -> list[dict[str, Any]]:
     """Generate synthetic product data."""
+    now_iso = datetime.now().isoformat()
+
+    # Draw category indices once, then fill each category's rows with names in a single masked draw
+    category_idx = rng.integers(0, len(PRODUCT_CATEGORIES), count)
+    categories = np.asarray(PRODUCT_CATEGORIES, dtype=object)[category_idx].tolist()
+    names = np.empty(count, dtype=object)
+    for c, category_names in enumerate(PRODUCT_NAME_ARRAYS):
+        mask = category_idx == c
+        names[mask] = category_names[rng.integers(0, len(category_names), mask.sum())]
+    names = names.tolist()
+    price = rng.uniform(2.50, 12.00, count).round(2)
+    cost = (price * rng.uniform(0.2, 0.4, count)).round(2)
+    profit_margin = ((price - cost) / price * 100).round(1)
+    subcategories = choose(["Hot", "Cold", "Food", "Beverage"], count)
+    in_stock = rng.random(count) < 0.75  # 75% in stock
+    # Out-of-stock products always have zero stock
+    stock_quantity = np.where(in_stock, rng.integers(0, 1001, count), 0).tolist()
+    in_stock = in_stock.tolist()
+    suppliers = [fake.company() for _ in range(count)] if FAKER_AVAILABLE else choose(FALLBACK_COMPANIES, count)
+    price, cost, profit_margin = price.tolist(), cost.tolist(), profit_margin.tolist()
+
     products = []
-    product_names = {
-        "Espresso": ["Single Espresso", "Double Espresso", "Americano", "Macchiato"],
-        "Latte": ["Vanilla Latte", "Caramel Latte", "Hazelnut Latte", "Classic Latte"],
-        "Cappuccino": ["Regular Cappuccino", "Vanilla Cappuccino", "Chocolate Cappuccino"],
-        "Iced Coffee": ["Iced Americano", "Iced Latte", "Cold Brew", "Iced Espresso"],
-        "Tea": ["Green Tea", "Black Tea", "Herbal Tea", "Chai Latte"],
-        "Pastry": ["Croissant", "Muffin", "Bagel", "Donut"],
-        "Sandwich": ["Breakfast Sandwich", "Turkey Sandwich", "Veggie Sandwich"]
-    }
-    
-    for i in range(1, count + 1):
-        category = random.choice(PRODUCT_CATEGORIES)
-        product_name = random.choice(product_names.get(category, ["Product"]))
-        price = round(random.uniform(2.50, 12.00), 2)
-        cost = round(price * random.uniform(0.2, 0.4), 2)
-        profit_margin = round(((price - cost) / price) * 100, 1)
-        
+    for i in range(count):
+        category = categories[i]
+        product_name = names[i]
+
         products.append({
-            "product_id": f"P{i:04d}",
+            "product_id": f"P{i + 1:04d}",
             "name": product_name,
             "category": category,
-            "subcategory": random.choice(["Hot", "Cold", "Food", "Beverage"]),
-            "price": price,
-            "cost": cost,
-            "profit_margin": profit_margin,
+            "subcategory": subcategories[i],
+            "price": price[i],
+            "cost": cost[i],
+            "profit_margin": profit_margin[i],
             "description": f"{product_name} - {category}",
-            "in_stock": random.choice([True, True, True, False]),  # 75% in stock
-            "stock_quantity": random.randint(0, 1000) if random.choice([True, True, True, False]) else 0,
-            "supplier": get_fake_company(),
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
+            "in_stock": in_stock[i],
+            "stock_quantity": stock_quantity[i],
+            "supplier": suppliers[i],
+            "created_at": now_iso,
+            "updated_at": now_iso
         })
     return products
 
 
-def generate_transactions(count: int, customers: list, products: list) -> list[dict[str, Any]]:
-    """Generate synthetic transaction data."""
+def generate_transactions(
+    count: int, customers: list, products: list, category_counts: Optional[np.ndarray] = None, start: int = 0
+) -> list[dict[str, Any]]:
+    """
+    Generate synthetic transaction data.
+    Purchases are also added to ``category_counts`` (see ``tally_categories``) when given.
+    """
+    now = datetime.now()
+    now_iso = now.isoformat()
+
+    customer_idx = rng.integers(0, len(customers), count)
+    product_idx = rng.integers(0, len(products), count)
+    quantity = rng.integers(1, 6, count)
+    if category_counts is not None:
+        product_category = np.array([CATEGORY_INDEX[product["category"]] for product in products])
+        tally_categories(category_counts, customer_idx, product_category[product_idx], quantity)
+    unit_price = np.array([product["price"] for product in products])[product_idx]
+    total_amount = (quantity * unit_price).round(2).tolist()
+    transaction_dates = days_before(now, rng.integers(0, 91, count))
+    payment_methods = choose(PAYMENT_METHODS, count)
+    locations = choose(["Downtown Store", "Mall Location", "Airport Store"], count)
+    has_campaign = (rng.random(count) < 0.3).tolist()
+    campaign_num = rng.integers(1, NUM_CAMPAIGNS + 1, count).tolist()
+    customer_idx, product_idx, quantity = customer_idx.tolist(), product_idx.tolist(), quantity.tolist()
+
     transactions = []
-    for i in range(1, count + 1):
-        customer = random.choice(customers)
-        product = random.choice(products)
-        quantity = random.randint(1, 5)
-        unit_price = product["price"]
-        total_amount = round(quantity * unit_price, 2)
-        
+    for i in range(count):
+        product = products[product_idx[i]]
+
         transactions.append({
-            "transaction_id": f"T{i:06d}",
-            "customer_id": customer["customer_id"],
+            "transaction_id": f"T{start + i + 1:06d}",
+            "customer_id": customers[customer_idx[i]]["customer_id"],
             "product_id": product["product_id"],
-            "quantity": quantity,
-            "unit_price": unit_price,
-            "total_amount": total_amount,
-            "transaction_date": (datetime.now() - timedelta(days=random.randint(0, 90))).isoformat(),
-            "payment_method": random.choice(PAYMENT_METHODS),
-            "location": random.choice(["Downtown Store", "Mall Location", "Airport Store"]),
-            "campaign_id": f"CAM{random.randint(1, NUM_CAMPAIGNS):03d}" if random.random() < 0.3 else None,
-            "created_at": datetime.now().isoformat()
+            "quantity": quantity[i],
+            "unit_price": product["price"],
+            "total_amount": total_amount[i],
+            "transaction_date": transaction_dates[i],
+            "payment_method": payment_methods[i],
+            "location": locations[i],
+            "campaign_id": f"CAM{campaign_num[i]:03d}" if has_campaign[i] else None,
+            "created_at": now_iso
         })
     return transactions
 
 
-def generate_orders(count: int, customers: list, products: list) -> list[dict[str, Any]]:
-    """Generate synthetic order data."""
+def generate_orders(
+    count: int, customers: list, products: list, category_counts: Optional[np.ndarray] = None, start: int = 0
+) -> list[dict[str, Any]]:
+    """
+    Generate synthetic order data.
+    Line items are also added to ``category_counts`` (see ``tally_categories``) when given.
+    """
+    now = datetime.now()
+    now_iso = now.isoformat()
+
+    customer_idx = rng.integers(0, len(customers), count)
+    num_items = rng.integers(1, 6, count)
+    order_dates = days_before(now, rng.integers(0, 91, count))
+    statuses = choose(["completed", "pending", "cancelled"], count)
+    payment_methods = choose(PAYMENT_METHODS, count)
+    locations = choose(["Downtown Store", "Mall Location", "Airport Store"], count)
+
+    # Line items for all orders come from one slab, consumed in order through a cursor
+    total_items = int(num_items.sum())
+    item_product_idx = rng.integers(0, len(products), total_items)
+    item_quantity = rng.integers(1, 4, total_items)
+    if category_counts is not None:
+        product_category = np.array([CATEGORY_INDEX[product["category"]] for product in products])
+        tally_categories(category_counts, np.repeat(customer_idx, num_items), product_category[item_product_idx], item_quantity)
+    customer_idx, num_items = customer_idx.tolist(), num_items.tolist()
+    item_product_idx, item_quantity = item_product_idx.tolist(), item_quantity.tolist()
+    cursor = 0
+
     orders = []
-    for i in range(1, count + 1):
-        customer = random.choice(customers)
-        num_items = random.randint(1, 5)
+    for i in range(count):
         items = []
         subtotal = 0.0
         
-        for _ in range(num_items):
-            product = random.choice(products)
-            quantity = random.randint(1, 3)
+        for k in range(cursor, cursor + num_items[i]):
+            product = products[item_product_idx[k]]
+            quantity = item_quantity[k]
             unit_price = product["price"]
             item_total = round(quantity * unit_price, 2)
             subtotal += item_total
@@ -248,131 +428,134 @@ def generate_orders(count: int, customers: list, products: list) -> list[dict[st
                 "total": item_total
             })
         
+        cursor += num_items[i]
         tax = round(subtotal * 0.08, 2)
         total = round(subtotal + tax, 2)
         
         orders.append({
-            "order_id": f"O{i:06d}",
-            "customer_id": customer["customer_id"],
-            "order_date": (datetime.now() - timedelta(days=random.randint(0, 90))).isoformat(),
+            "order_id": f"O{start + i + 1:06d}",
+            "customer_id": customers[customer_idx[i]]["customer_id"],
+            "order_date": order_dates[i],
             "items": items,
             "subtotal": subtotal,
             "tax": tax,
             "total": total,
-            "status": random.choice(["completed", "pending", "cancelled"]),
-            "payment_method": random.choice(PAYMENT_METHODS),
-            "location": random.choice(["Downtown Store", "Mall Location", "Airport Store"]),
-            "created_at": datetime.now().isoformat()
+            "status": statuses[i],
+            "payment_method": payment_methods[i],
+            "location": locations[i],
+            "created_at": now_iso
         })
     return orders
 
 
+def stream_records(generate: Callable[..., list], count: int, *args: Any) -> Iterator[dict[str, Any]]:
+    """Yield ``count`` records from a column-vectorized generator, one chunk at a time."""
+    for start in range(0, count, GENERATION_CHUNK_SIZE):
+        yield from generate(min(GENERATION_CHUNK_SIZE, count - start), *args, start=start)
+
+
 def generate_campaigns(count: int) -> list[dict[str, Any]]:
     """Generate synthetic campaign data with all fields needed for frontend."""
+    now = datetime.now()
+    now_iso = now.isoformat()
+
+    campaign_types = choose(CAMPAIGN_TYPES, count)
+    start_days_ago = rng.integers(0, 61, count)
+    start_dates = days_before(now, start_days_ago)
+    end_dates = days_before(now, start_days_ago - rng.integers(7, 31, count))
+    statuses = choose(CAMPAIGN_STATUSES, count)
+    target_segments = choose(CUSTOMER_SEGMENTS, count)
+    discounts = rng.integers(10, 31, count).tolist()
+    channels = choose(["Email", "SMS", "Social Media", "In-App"], count)
+
+    # Generate campaign performance metrics
+    # Response rate: percentage of target segment that responded
+    response_rate = rng.uniform(15.0, 45.0, count).round(1)
+    # Conversion rate: percentage of responders who converted
+    conversion_rate = (response_rate * rng.uniform(0.25, 0.40, count)).round(1)  # 25-40% of responders convert
+    # Email metrics
+    open_rate = np.minimum(100, response_rate * rng.uniform(1.2, 1.8, count)).round(1)  # Open rate higher than response
+    click_rate = (open_rate * rng.uniform(0.15, 0.25, count)).round(1)  # 15-25% of opens result in clicks
+    # Campaign spend and revenue
+    total_spend = rng.uniform(500.0, 5000.0, count).round(2)
+    # Revenue is typically 3-5x spend for successful campaigns
+    total_revenue = (total_spend * rng.uniform(2.5, 5.0, count)).round(2)
+    # ROI calculation
+    roi = ((total_revenue - total_spend) / total_spend * 100).round(1)
+    response_rate, conversion_rate, open_rate, click_rate, total_spend, total_revenue, roi = (
+        column.tolist() for column in (
+            response_rate, conversion_rate, open_rate, click_rate, total_spend, total_revenue, roi
+        )
+    )
+
     campaigns = []
-    for i in range(1, count + 1):
-        campaign_type = random.choice(CAMPAIGN_TYPES)
-        start_date = datetime.now() - timedelta(days=random.randint(0, 60))
-        end_date = start_date + timedelta(days=random.randint(7, 30))
-        status = random.choice(CAMPAIGN_STATUSES)
-        target_segment = random.choice(CUSTOMER_SEGMENTS)
-        
-        # Generate campaign performance metrics
-        # Response rate: percentage of target segment that responded
-        response_rate = round(random.uniform(15.0, 45.0), 1)
-        
-        # Conversion rate: percentage of responders who converted
-        conversion_rate = round(response_rate * random.uniform(0.25, 0.40), 1)  # 25-40% of responders convert
-        
-        # Email metrics
-        open_rate = round(min(100, response_rate * random.uniform(1.2, 1.8)), 1)  # Open rate higher than response
-        click_rate = round(open_rate * random.uniform(0.15, 0.25), 1)  # 15-25% of opens result in clicks
-        
-        # Campaign spend and revenue
-        total_spend = round(random.uniform(500.0, 5000.0), 2)
-        # Revenue is typically 3-5x spend for successful campaigns
-        total_revenue = round(total_spend * random.uniform(2.5, 5.0), 2)
-        
-        # ROI calculation
-        roi = round(((total_revenue - total_spend) / total_spend) * 100, 1)
-        
+    for i in range(count):
+        campaign_type = campaign_types[i]
+
         campaigns.append({
-            "campaign_id": f"CAM{i:03d}",
-            "name": f"{campaign_type} Campaign {i}",
+            "campaign_id": f"CAM{i + 1:03d}",
+            "name": f"{campaign_type} Campaign {i + 1}",
             "type": campaign_type,
-            "start_date": start_date.isoformat(),
-            "end_date": end_date.isoformat(),
-            "discount_percentage": random.randint(10, 30) if campaign_type == "Discount" else None,
-            "target_segment": target_segment,
-            "status": status,
+            "start_date": start_dates[i],
+            "end_date": end_dates[i],
+            "discount_percentage": discounts[i] if campaign_type == "Discount" else None,
+            "target_segment": target_segments[i],
+            "status": statuses[i],
             # Campaign performance metrics
-            "response_rate": response_rate,
-            "conversion_rate": conversion_rate,
-            "open_rate": open_rate,
-            "click_rate": click_rate,
+            "response_rate": response_rate[i],
+            "conversion_rate": conversion_rate[i],
+            "open_rate": open_rate[i],
+            "click_rate": click_rate[i],
             # Financial metrics
-            "total_spend": total_spend,
-            "total_revenue": total_revenue,
-            "roi": roi,
+            "total_spend": total_spend[i],
+            "total_revenue": total_revenue[i],
+            "roi": roi[i],
             # Channel (for frontend display)
-            "channel": random.choice(["Email", "SMS", "Social Media", "In-App"]),
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
+            "channel": channels[i],
+            "created_at": now_iso,
+            "updated_at": now_iso
         })
     return campaigns
 
 
 def generate_customer_profile_text(customer: dict) -> str:
     """Generate searchable text description for customer profile."""
-    parts = []
-    parts.append(f"{customer['first_name']} {customer['last_name']} is a {customer['customer_segment']} customer")
-    
-    if customer['loyalty_member']:
-        parts.append(f"who is a loyalty member with {customer['loyalty_points']} loyalty points")
-    
-    parts.append(f"who prefers {customer['preferred_category']}")
-    parts.append(f"and visits {customer['visit_frequency'].lower()}")
-    parts.append(f"typically in the {customer['preferred_time'].lower()}")
-    
-    parts.append(f"He has made {customer['total_purchases']} purchases")
-    parts.append(f"and spent ${customer['total_spent']:.2f} in total")
-    parts.append(f"with an average order value of ${customer['avg_order_value']:.2f}")
-    
+    loyalty = (
+        f". who is a loyalty member with {customer['loyalty_points']} loyalty points"
+        if customer['loyalty_member'] else ""
+    )
     if customer['loyalty_points'] > 2000:
-        parts.append("He is a highly engaged customer")
+        engagement = ". He is a highly engaged customer"
     elif customer['total_spent'] > 1000:
-        parts.append("He is a valuable customer")
+        engagement = ". He is a valuable customer"
+    else:
+        engagement = ""
     
-    return ". ".join(parts) + "."
+    return (
+        f"{customer['first_name']} {customer['last_name']} is a {customer['customer_segment']} customer{loyalty}. "
+        f"who prefers {customer['preferred_category']}. "
+        f"and visits {customer['visit_frequency'].lower()}. "
+        f"typically in the {customer['preferred_time'].lower()}. "
+        f"He has made {customer['total_purchases']} purchases. "
+        f"and spent ${customer['total_spent']:.2f} in total. "
+        f"with an average order value of ${customer['avg_order_value']:.2f}{engagement}."
+    )
 
 
 def generate_product_description_text(product: dict) -> str:
     """Generate searchable text description for product."""
-    parts = []
-    parts.append(f"{product['name']} is a {product['category']} product")
-    parts.append(f"priced at ${product['price']:.2f}")
-    
-    if product['category'] == "Espresso":
-        parts.append("with a rich, bold flavor and notes of chocolate and caramel")
-        parts.append("Perfect for coffee enthusiasts who enjoy a strong, aromatic coffee experience")
-    elif product['category'] == "Latte":
-        parts.append("with a smooth, creamy texture and sweet flavor")
-        parts.append("Ideal for those who prefer a milder coffee taste")
-    elif product['category'] == "Iced Coffee":
-        parts.append("refreshing and perfect for hot days")
-        parts.append("Made with premium coffee beans and served over ice")
-    elif product['category'] == "Pastry":
-        parts.append("freshly baked daily")
-        parts.append("Perfect pairing with coffee or tea")
-    
-    parts.append(f"It has a profit margin of {product['profit_margin']}%")
-    
+    blurb = CATEGORY_BLURBS.get(product['category'])
+    blurb = f"{blurb}. " if blurb else ""
     if product['in_stock']:
-        parts.append(f"and is currently in stock with {product['stock_quantity']} units available")
+        stock = f"and is currently in stock with {product['stock_quantity']} units available"
     else:
-        parts.append("and is currently out of stock")
+        stock = "and is currently out of stock"
     
-    return ". ".join(parts) + "."
+    return (
+        f"{product['name']} is a {product['category']} product. "
+        f"priced at ${product['price']:.2f}. "
+        f"{blurb}It has a profit margin of {product['profit_margin']}%. {stock}."
+    )
 
 
 def generate_faq_text() -> str:
@@ -404,123 +587,126 @@ def generate_feedback_text(customer: dict, product: dict) -> str:
     return random.choice(feedback_templates)
 
 
-def analyze_customer_favorite_products(customers: list, orders: list, transactions: list, products: list) -> list:
+def analyze_customer_favorite_products(customers: list, category_counts: np.ndarray) -> list:
     """
     Analyze favorite products for each customer based on frequent orders.
     Updates customer's preferred_category based on their order history.
+    ``category_counts`` is the customers x PRODUCT_CATEGORIES quantity matrix
+    filled in by ``generate_orders``/``generate_transactions`` as they run.
     """
     print(f"\n🔍 Analyzing favorite products from orders and transactions...")
     
-    # Create product lookup by ID
-    product_lookup = {p["product_id"]: p for p in products}
-    
-    # Create customer lookup by ID
-    customer_lookup = {c["customer_id"]: c for c in customers}
-    
-    # Count product categories per customer from orders
-    customer_category_count = {}
+    # Counts tallied at generation time must line up with the customers being updated
+    if category_counts.shape != (len(customers), len(PRODUCT_CATEGORIES)):
+        raise ValueError(
+            f"category counts shape {category_counts.shape} does not match "
+            f"{len(customers)} customers x {len(PRODUCT_CATEGORIES)} categories"
+        )
     
-    # Analyze orders
-    for order in orders:
-        customer_id = order.get("customer_id")
-        if not customer_id:
-            continue
-            
-        items = order.get("items", [])
-        for item in items:
-            product_id = item.get("product_id")
-            quantity = item.get("quantity", 1)
-            
-            if product_id and product_id in product_lookup:
-                product = product_lookup[product_id]
-                category = product.get("category", "Other")
-                
-                if customer_id not in customer_category_count:
-                    customer_category_count[customer_id] = {}
-                
-                customer_category_count[customer_id][category] = customer_category_count[customer_id].get(category, 0) + quantity
+    # The favorite is the row argmax; customers with no purchases keep their current category
+    has_purchases = (category_counts.sum(axis=1) > 0).tolist()
+    favorite_idx = category_counts.argmax(axis=1).tolist()
     
-    # Analyze transactions
-    for transaction in transactions:
-        customer_id = transaction.get("customer_id")
-        product_id = transaction.get("product_id")
-        quantity = transaction.get("quantity", 1)
+    # Update customers with favorite categories and ensure all required fields
+    updated_count = 0
+    for i, customer in enumerate(customers):
+        # Update favorite category based on order analysis
+        if has_purchases[i]:
+            favorite_category = PRODUCT_CATEGORIES[favorite_idx[i]]
+            customer["preferred_category"] = favorite_category
+            customer["favorite_product_category"] = favorite_category
+            updated_count += 1
+        elif "favorite_product_category" not in customer:
+            # Fallback to existing or random
+            customer["favorite_product_category"] = customer.get("preferred_category", random.choice(PRODUCT_CATEGORIES))
         
-        if customer_id and product_id and product_id in product_lookup:
-            product = product_lookup[product_id]
-            category = product.get("category", "Other")
-            
-            if customer_id not in customer_category_count:
-                customer_category_count[customer_id] = {}
-            
-            customer_category_count[customer_id][category] = customer_category_count[customer_id].get(category, 0) + quantity
-    
-        # Update customers with favorite categories and ensure all required fields
-        updated_count = 0
-        for customer in customers:
-            customer_id = customer["customer_id"]
-            
-            # Ensure preferred_contact_method is set to phone number
-            if "phone" in customer:
-                customer["preferred_contact_method"] = customer["phone"]
-            elif "preferred_contact_method" not in customer:
-                customer["preferred_contact_method"] = get_fake_phone()
-                customer["phone"] = customer["preferred_contact_method"]
-            
-            # Update favorite category based on order analysis
-            if customer_id in customer_category_count:
-                categories = customer_category_count[customer_id]
-                if categories:
-                    # Get category with highest count
-                    favorite_category = max(categories.items(), key=lambda x: x[1])[0]
-                    customer["preferred_category"] = favorite_category
-                    customer["favorite_product_category"] = favorite_category
-                    updated_count += 1
-                else:
-                    # Fallback to existing or random
-                    if "favorite_product_category" not in customer:
-                        customer["favorite_product_category"] = customer.get("preferred_category", random.choice(PRODUCT_CATEGORIES))
-            else:
-                # Ensure favorite_product_category exists
-                if "favorite_product_category" not in customer:
-                    customer["favorite_product_category"] = customer.get("preferred_category", random.choice(PRODUCT_CATEGORIES))
-            
-            # Ensure all required numeric fields are present and valid
-            if "churn_risk_score" not in customer or customer["churn_risk_score"] is None:
-                customer["churn_risk_score"] = round(random.uniform(0.1, 0.7), 2)
-            
-            if "lifetime_value" not in customer or customer["lifetime_value"] is None:
-                customer["lifetime_value"] = customer.get("total_spent", 0) * random.uniform(1.1, 1.5)
-            
-            # Ensure campaign engagement metrics exist
-            if "responded_to_campaigns" not in customer:
-                customer["responded_to_campaigns"] = random.randint(0, min(customer.get("total_purchases", 0), 20))
-            
-            if "converted_campaigns" not in customer:
-                customer["converted_campaigns"] = random.randint(0, int(customer.get("responded_to_campaigns", 0) * 0.3))
-            
-            # Ensure email metrics exist
-            if "email_open_rate" not in customer:
-                customer["email_open_rate"] = round(random.uniform(15.0, 45.0), 1)
-            
-            if "email_click_rate" not in customer:
-                customer["email_click_rate"] = round(random.uniform(2.0, 8.0), 1)
-            
-            # Ensure other metrics exist
-            if "satisfaction_score" not in customer:
-                customer["satisfaction_score"] = round(random.uniform(3.5, 5.0), 1)
-            
-            if "sms_response_rate" not in customer:
-                customer["sms_response_rate"] = round(random.uniform(10.0, 25.0), 1)
+        # Ensure all required numeric fields are present and valid
+        if "churn_risk_score" not in customer or customer["churn_risk_score"] is None:
+            customer["churn_risk_score"] = round(random.uniform(0.1, 0.7), 2)
+        
+        if "lifetime_value" not in customer or customer["lifetime_value"] is None:
+            customer["lifetime_value"] = customer.get("total_spent", 0) * random.uniform(1.1, 1.5)
+        
+        # Ensure campaign engagement metrics exist
+        if "responded_to_campaigns" not in customer:
+            customer["responded_to_campaigns"] = random.randint(0, min(customer.get("total_purchases", 0), 20))
         
-        print(f"   ✅ Updated {updated_count} customers with favorite products from order analysis")
-        print(f"   ✅ Ensured all customers have required fields for frontend display")
-        return customers
+        if "converted_campaigns" not in customer:
+            customer["converted_campaigns"] = random.randint(0, int(customer.get("responded_to_campaigns", 0) * 0.3))
+        
+        # Ensure email metrics exist
+        if "email_open_rate" not in customer:
+            customer["email_open_rate"] = round(random.uniform(15.0, 45.0), 1)
+        
+        if "email_click_rate" not in customer:
+            customer["email_click_rate"] = round(random.uniform(2.0, 8.0), 1)
+        
+        # Ensure other metrics exist
+        if "satisfaction_score" not in customer:
+            customer["satisfaction_score"] = round(random.uniform(3.5, 5.0), 1)
+        
+        if "sms_response_rate" not in customer:
+            customer["sms_response_rate"] = round(random.uniform(10.0, 25.0), 1)
+    
+    print(f"   ✅ Updated {updated_count} customers with favorite products from order analysis")
+    print(f"   ✅ Ensured all customers have required fields for frontend display")
+    return customers
+
 
+def produce_batches(documents: Iterable[dict], batch_size: int, batches: queue.Queue):
+    """Producer thread: put ``batch_size``-document lists on ``batches``, then a None sentinel."""
+    try:
+        documents = iter(documents)
+        while batch := list(islice(documents, batch_size)):
+            batches.put(batch)
+    except Exception as e:
+        # Hand the failure to the consumer so it is raised on the main thread
+        batches.put(e)
+        return
+    batches.put(None)
 
-def import_structured_data_to_mongodb(data: dict[str, list]):
-    """Import structured data directly to MongoDB collections."""
-    from pymongo import MongoClient
+
+def pipelined_insert(documents: Iterable[Any], insert: Callable[[list], int]) -> int:
+    """
+    Insert ``documents`` batch by batch with ``insert`` (which returns the number
+    written), overlapping generation (producer thread) with the network
+    round-trips of the inserts (this thread).
+    """
+    batches: queue.Queue = queue.Queue(maxsize=4)
+    producer = threading.Thread(
+        target=produce_batches,
+        args=(documents, GENERATION_CHUNK_SIZE, batches),
+        daemon=True,
+    )
+    producer.start()
+    total_inserted = 0
+    while (batch := batches.get()) is not None:
+        if isinstance(batch, Exception):
+            raise batch
+        total_inserted += insert(batch)
+    producer.join()
+    return total_inserted
+
+
+def import_structured_data_to_mongodb(collections: dict[str, Iterable[dict]]):
+    """
+    Import structured data directly to MongoDB collections.
+
+    Collections are imported in the given order and each may be a lazy
+    iterable; a producer thread builds the next batches while the current
+    one is being inserted, with at most a few batches held in memory.
+
+    With PyMongo 4.9+ against MongoDB 8.0+, all collections go through
+    client-level bulk_write so one round trip can carry documents for
+    several collections; otherwise each collection uses insert_many.
+
+    Inserts are unordered so the server can apply each batch in parallel.
+    Set SEED_UNACKNOWLEDGED_WRITES=1 to also skip write acknowledgements
+    (w=0) on throwaway dev databases; insert errors are then not reported
+    and the summary shows documents sent rather than inserted.
+    """
+    from pymongo import InsertOne, MongoClient
+    from pymongo.write_concern import WriteConcern
     
     # Get MongoDB connection
     mongodb_uri = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
@@ -533,34 +719,59 @@ def import_structured_data_to_mongodb(data: dict[str, list]):
     try:
         client = MongoClient(mongodb_uri, serverSelectionTimeoutMS=5000)
         # Test connection
-        client.server_info()
+        server_info = client.server_info()
         
         db = client[mongodb_database]
+        unacknowledged = os.getenv("SEED_UNACKNOWLEDGED_WRITES") == "1"
+        write_concern = WriteConcern(w=0) if unacknowledged else None
         
-        # Import each collection
-        collections = {
-            "customers": data["customers"],
-            "products": data["products"],
-            "transactions": data["transactions"],
-            "orders": data["orders"],
-            "campaigns": data["campaigns"]
-        }
+        # Clear existing data (optional - uncomment to clear before inserting)
+        # for collection_name in collections:
+        #     db[collection_name].delete_many({})
         
-        for collection_name, documents in collections.items():
-            collection = db[collection_name]
+        # MongoClient.bulk_write needs PyMongo 4.9+ and the server's bulkWrite command (8.0+)
+        # Without acknowledgements only the number of documents sent is known
+        outcome = "Sent" if unacknowledged else "Inserted"
+        if hasattr(client, "bulk_write") and server_info.get("versionArray", [0])[0] >= 8:
+            counts = dict.fromkeys(collections, 0)
             
-            # Clear existing data (optional - uncomment to clear before inserting)
-            # collection.delete_many({})
+            def insert_ops():
+                for collection_name, documents in collections.items():
+                    namespace = f"{db.name}.{collection_name}"
+                    for document in documents:
+                        yield collection_name, InsertOne(document, namespace=namespace)
             
-            # Insert documents in batches for better performance
-            batch_size = 1000
-            total_inserted = 0
-            for i in range(0, len(documents), batch_size):
-                batch = documents[i:i + batch_size]
-                result = collection.insert_many(batch)
-                total_inserted += len(result.inserted_ids)
+            def client_bulk_write(batch: list) -> int:
+                names, ops = zip(*batch)
+                result = client.bulk_write(
+                    list(ops),
+                    ordered=False,
+                    bypass_document_validation=True,
+                    write_concern=write_concern,
+                    # Per-operation results map each acknowledged insert back to its collection
+                    verbose_results=not unacknowledged,
+                )
+                if not result.acknowledged:
+                    for collection_name in names:
+                        counts[collection_name] += 1
+                    return len(ops)
+                for index in result.insert_results:
+                    counts[names[index]] += 1
+                return len(result.insert_results)
             
-            print(f"   ✅ {collection_name}: Inserted {total_inserted} documents")
+            pipelined_insert(insert_ops(), client_bulk_write)
+            for collection_name, total in counts.items():
+                print(f"   ✅ {collection_name}: {outcome} {total} documents")
+        else:
+            for collection_name, documents in collections.items():
+                collection = db.get_collection(collection_name, write_concern=write_concern)
+                total_inserted = pipelined_insert(
+                    documents,
+                    lambda batch: len(
+                        collection.insert_many(batch, ordered=False, bypass_document_validation=True).inserted_ids
+                    ),
+                )
+                print(f"   ✅ {collection_name}: {outcome} {total_inserted} documents")
         
         client.close()
         print(f"   ✅ Structured data import complete!\n")
@@ -570,114 +781,106 @@ def import_structured_data_to_mongodb(data: dict[str, list]):
         raise
 
 
+def chunks(items: list, size: int):
+    """Yield consecutive slices of ``items`` of at most ``size`` elements."""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def post_rag_documents(items: list, source: Optional[str]) -> requests.Response:
+    """POST one batch of RAG chunks to the documents endpoint."""
+    body = _json_dumps({
+        "texts": [item["text"] for item in items],
+        "source": source,
+        "metadatas": [item["metadata"] for item in items]
+    })
+    headers = {"Content-Type": "application/json"}
+    if len(body) >= RAG_UPLOAD_GZIP_MIN_BYTES:
+        # Templated text compresses well; the API inflates it in GzipRequestMiddleware
+        body = gzip.compress(body, compresslevel=3)
+        headers["Content-Encoding"] = "gzip"
+    return SESSION.post(
+        f"{API_BASE_URL}/langchain-rag/documents",
+        data=body,
+        headers=headers,
+        timeout=300
+    )
+
+
 def import_rag_chunks_via_api(customer_profiles: list, product_descriptions: list, faqs: list, feedbacks: list, campaign_descriptions: list):
-    """Import RAG chunks via API (for vector search)."""
+    """Import RAG chunks via API (for vector search), uploading sub-batches concurrently."""
     print(f"\n🔍 Importing RAG chunks via API for vector search...")
     print(f"   API URL: {API_BASE_URL}")
     
-    # Import customer profiles
-    if customer_profiles:
-        print(f"   Importing {len(customer_profiles)} customer profiles...")
-        try:
-            response = requests.post(
-                f"{API_BASE_URL}/langchain-rag/documents",
-                json={
-                    "texts": [item["text"] for item in customer_profiles],
-                    "source": "customer_profiles",
-                    "metadatas": [item["metadata"] for item in customer_profiles]
-                },
-                timeout=300
-            )
-            if response.status_code == 200:
-                print(f"   ✅ Customer profiles: Imported successfully")
-            else:
-                print(f"   ⚠️  Customer profiles: {response.status_code} - {response.text}")
-        except Exception as e:
-            print(f"   ❌ Customer profiles: Error - {e}")
-    
-    # Import product descriptions
-    if product_descriptions:
-        print(f"   Importing {len(product_descriptions)} product descriptions...")
-        try:
-            response = requests.post(
-                f"{API_BASE_URL}/langchain-rag/documents",
-                json={
-                    "texts": [item["text"] for item in product_descriptions],
-                    "source": "product_descriptions",
-                    "metadatas": [item["metadata"] for item in product_descriptions]
-                },
-                timeout=300
-            )
-            if response.status_code == 200:
-                print(f"   ✅ Product descriptions: Imported successfully")
-            else:
-                print(f"   ⚠️  Product descriptions: {response.status_code} - {response.text}")
-        except Exception as e:
-            print(f"   ❌ Product descriptions: Error - {e}")
-    
-    # Import FAQs
-    if faqs:
-        print(f"   Importing {len(faqs)} FAQs...")
-        try:
-            response = requests.post(
-                f"{API_BASE_URL}/langchain-rag/documents",
-                json={
-                    "texts": [item["text"] for item in faqs],
-                    "source": "faq_documents",
-                    "metadatas": [item["metadata"] for item in faqs]
-                },
-                timeout=300
-            )
-            if response.status_code == 200:
-                print(f"   ✅ FAQs: Imported successfully")
-            else:
-                print(f"   ⚠️  FAQs: {response.status_code} - {response.text}")
-        except Exception as e:
-            print(f"   ❌ FAQs: Error - {e}")
-    
-    # Import customer feedback
-    if feedbacks:
-        print(f"   Importing {len(feedbacks)} customer feedback...")
-        try:
-            response = requests.post(
-                f"{API_BASE_URL}/langchain-rag/documents",
-                json={
-                    "texts": [item["text"] for item in feedbacks],
-                    "source": "customer_feedback",
-                    "metadatas": [item["metadata"] for item in feedbacks]
-                },
-                timeout=300
-            )
-            if response.status_code == 200:
-                print(f"   ✅ Customer feedback: Imported successfully")
-            else:
-                print(f"   ⚠️  Customer feedback: {response.status_code} - {response.text}")
-        except Exception as e:
-            print(f"   ❌ Customer feedback: Error - {e}")
-    
-    # Import campaign descriptions
-    if campaign_descriptions:
-        print(f"   Importing {len(campaign_descriptions)} campaign descriptions...")
-        try:
-            response = requests.post(
-                f"{API_BASE_URL}/langchain-rag/documents",
-                json={
-                    "texts": [item["text"] for item in campaign_descriptions],
-                    "source": "campaign_descriptions",
-                    "metadatas": [item["metadata"] for item in campaign_descriptions]
-                },
-                timeout=300
-            )
-            if response.status_code == 200:
-                print(f"   ✅ Campaign descriptions: Imported successfully")
-            else:
-                print(f"   ⚠️  Campaign descriptions: {response.status_code} - {response.text}")
-        except Exception as e:
-            print(f"   ❌ Campaign descriptions: Error - {e}")
+    jobs = [
+        ("Customer profiles", "customer profiles", customer_profiles, "customer_profiles"),
+        ("Product descriptions", "product descriptions", product_descriptions, "product_descriptions"),
+        ("FAQs", "FAQs", faqs, "faq_documents"),
+        ("Customer feedback", "customer feedback", feedbacks, "customer_feedback"),
+        ("Campaign descriptions", "campaign descriptions", campaign_descriptions, "campaign_descriptions"),
+    ]
+    jobs = [job for job in jobs if job[2]]
+
+    for _, noun, items, _ in jobs:
+        print(f"   Importing {len(items)} {noun}...")
+
+    # Sources too small to fill a batch share one POST. Each item then carries its own
+    # source in metadata (the API only stamps the request-level source when one is given).
+    small = [job for job in jobs if len(job[2]) < RAG_UPLOAD_BATCH_SIZE]
+    if len(small) > 1:
+        merged = [
+            {**item, "metadata": {**item["metadata"], "source": source}}
+            for _, _, items, source in small
+            for item in items
+        ]
+        jobs = [job for job in jobs if len(job[2]) >= RAG_UPLOAD_BATCH_SIZE]
+        jobs.append((" + ".join(label for label, _, _, _ in small), "small-source documents", merged, None))
+
+    # Each source is split into sub-batches; up to RAG_UPLOAD_WORKERS are in flight.
+    # Items are sorted by text length first so each batch holds similarly sized texts
+    # and no short batch waits on one outlier (the metadata still identifies each item).
+    problems: dict[str, str] = {}
+    with ThreadPoolExecutor(max_workers=RAG_UPLOAD_WORKERS) as executor:
+        futures = {
+            executor.submit(post_rag_documents, batch, source): label
+            for label, _, items, source in jobs
+            for batch in chunks(sorted(items, key=lambda item: len(item["text"])), RAG_UPLOAD_BATCH_SIZE)
+        }
+        for future in as_completed(futures):
+            label = futures[future]
+            try:
+                response = future.result()
+                if response.status_code != 200:
+                    problems.setdefault(label, f"⚠️  {label}: {response.status_code} - {response.text}")
+            except Exception as e:
+                problems.setdefault(label, f"❌ {label}: Error - {e}")
+
+    for label, _, _, _ in jobs:
+        print(f"   {problems.get(label, f'✅ {label}: Imported successfully')}")
     
     print(f"   ✅ RAG chunks import complete!\n")
 
 
+def dedupe_by_text(items: list, label: str, merge_keys: Sequence[str] = ()) -> list:
+    """
+    Drop items whose text was already seen, so no text is embedded twice.
+    For each key in ``merge_keys`` the first occurrence also gets a ``<key>s``
+    list with the values from all of its duplicates (e.g. ``customer_ids``).
+    """
+    unique: dict[str, dict] = {}
+    for item in items:
+        first = unique.get(item["text"])
+        if first is None:
+            unique[item["text"]] = item
+            continue
+        for key in merge_keys:
+            metadata = first["metadata"]
+            metadata.setdefault(f"{key}s", [metadata[key]]).append(item["metadata"][key])
+    if len(unique) < len(items):
+        print(f"   ♻️  Dropped {len(items) - len(unique)} duplicate {label}")
+    return list(unique.values())
+
+
 def main():
     """Main function to generate and import all data."""
     print("=" * 80)
@@ -688,28 +891,31 @@ def main():
     print("\n1. Generating structured data...")
     customers = generate_customers(NUM_CUSTOMERS)
     products = generate_products(NUM_PRODUCTS)
-    transactions = generate_transactions(NUM_TRANSACTIONS, customers, products)
-    orders = generate_orders(NUM_ORDERS, customers, products)
     campaigns = generate_campaigns(NUM_CAMPAIGNS)
     
     print(f"   ✅ Generated {len(customers)} customers")
     print(f"   ✅ Generated {len(products)} products")
-    print(f"   ✅ Generated {len(transactions)} transactions")
-    print(f"   ✅ Generated {len(orders)} orders")
     print(f"   ✅ Generated {len(campaigns)} campaigns")
+    print(f"   ⏳ Streaming {NUM_TRANSACTIONS} transactions and {NUM_ORDERS} orders during import")
     
-    # Analyze favorite products from orders and update customers
-    customers = analyze_customer_favorite_products(customers, orders, transactions, products)
+    # Transactions and orders are never held in full: they are generated chunk by
+    # chunk while being inserted, tallying purchased categories per customer as they go
+    category_counts = np.zeros((len(customers), len(PRODUCT_CATEGORIES)), dtype=np.int64)
+    transactions = stream_records(generate_transactions, NUM_TRANSACTIONS, customers, products, category_counts)
+    orders = stream_records(generate_orders, NUM_ORDERS, customers, products, category_counts)
     
-    # Import structured data to MongoDB
-    structured_data = {
-        "customers": customers,
+    def analyzed_customers() -> Iterator[dict]:
+        # Lazy, so the analysis runs after transactions and orders have streamed through
+        yield from analyze_customer_favorite_products(customers, category_counts)
+    
+    # Import structured data to MongoDB (customers last, once favorites are known)
+    import_structured_data_to_mongodb({
         "products": products,
+        "campaigns": campaigns,
         "transactions": transactions,
         "orders": orders,
-        "campaigns": campaigns
-    }
-    import_structured_data_to_mongodb(structured_data)
+        "customers": analyzed_customers(),
+    })
     
     # Generate RAG chunks (searchable text)
     print("\n2. Generating RAG chunks for vector search...")
@@ -741,6 +947,7 @@ def main():
         })
     
     # FAQs
+    faq_topics = choose(["loyalty", "products", "hours", "payment", "orders"], NUM_FAQS)
     faqs = []
     for i in range(NUM_FAQS):
         faqs.append({
@@ -749,15 +956,19 @@ def main():
                 "type": "faq",
                 "category": "knowledge_base",
                 "title": f"FAQ {i+1}",
-                "topic": random.choice(["loyalty", "products", "hours", "payment", "orders"])
+                "topic": faq_topics[i]
             }
         })
     
     # Customer feedback
+    feedback_dates = days_before(datetime.now(), rng.integers(0, 91, NUM_FEEDBACK))
+    feedback_customers = rng.integers(0, len(customers), NUM_FEEDBACK).tolist()
+    feedback_products = rng.integers(0, len(products), NUM_FEEDBACK).tolist()
+    feedback_ratings = rng.integers(3, 6, NUM_FEEDBACK).tolist()
     feedbacks = []
     for i in range(NUM_FEEDBACK):
-        customer = random.choice(customers)
-        product = random.choice(products)
+        customer = customers[feedback_customers[i]]
+        product = products[feedback_products[i]]
         feedbacks.append({
             "text": generate_feedback_text(customer, product),
             "metadata": {
@@ -765,8 +976,8 @@ def main():
                 "product_id": product["product_id"],
                 "type": "customer_feedback",
                 "category": "reviews",
-                "rating": random.randint(3, 5),
-                "date": (datetime.now() - timedelta(days=random.randint(0, 90))).isoformat()
+                "rating": feedback_ratings[i],
+                "date": feedback_dates[i]
             }
         })
     
@@ -783,6 +994,13 @@ def main():
             }
         })
     
+    # Templated texts repeat; upload (and embed) each distinct text once
+    customer_profiles = dedupe_by_text(customer_profiles, "customer profiles")
+    product_descriptions = dedupe_by_text(product_descriptions, "product descriptions")
+    faqs = dedupe_by_text(faqs, "FAQs")
+    feedbacks = dedupe_by_text(feedbacks, "customer feedback", merge_keys=("customer_id", "product_id"))
+    campaign_descriptions = dedupe_by_text(campaign_descriptions, "campaign descriptions")
+    
     print(f"   ✅ Generated {len(customer_profiles)} customer profiles")
     print(f"   ✅ Generated {len(product_descriptions)} product descriptions")
     print(f"   ✅ Generated {len(faqs)} FAQs")
@@ -802,7 +1020,7 @@ def main():
     print("✅ Data generation and import complete!")
     print("=" * 80)
     print("\n📊 Summary:")
-    print(f"   - Structured data: {len(customers)} customers, {len(products)} products, {len(transactions)} transactions, {len(orders)} orders, {len(campaigns)} campaigns")
+    print(f"   - Structured data: {len(customers)} customers, {len(products)} products, {NUM_TRANSACTIONS} transactions, {NUM_ORDERS} orders, {len(campaigns)} campaigns")
     print(f"   - RAG chunks: {len(customer_profiles)} profiles, {len(product_descriptions)} descriptions, {len(faqs)} FAQs, {len(feedbacks)} feedback, {len(campaign_descriptions)} campaigns")
     print(f"\n🔍 Vector search is available in the 'chunks' collection")
     print(f"📊 Structured data is available in: customers, products, transactions, orders, campaigns collections")
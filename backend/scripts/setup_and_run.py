@@ -113,16 +113,45 @@ def main():
     print("\nPress CTRL+C to stop the server\n")
     
     try:
-        subprocess.run([
-            sys.executable, '-m', 'uvicorn',
-            'app.main:app',
-            '--reload',
-            '--host', '0.0.0.0',
-            '--port', '8000'
-        ])
+        subprocess.run(uvicorn_command())
     except KeyboardInterrupt:
         print("\n\nServer stopped.")
 
+def uvicorn_command():
+    """
+    Build the uvicorn command line.
+
+    WEB_CONCURRENCY sets the worker count (for I/O-bound production use,
+    2 * CPUs + 1 is a reasonable start). Reload is on for a single worker
+    unless DEV=0; it cannot be combined with multiple workers.
+    """
+    workers = int(os.getenv('WEB_CONCURRENCY', '1'))
+    reload = workers == 1 and os.getenv('DEV', '1') == '1'
+
+    command = [
+        sys.executable, '-m', 'uvicorn',
+        'app.main:app',
+        '--host', '0.0.0.0',
+        '--port', '8000',
+    ]
+    # uvicorn[standard] ships uvloop and httptools; select them explicitly when present
+    try:
+        import uvloop  # noqa: F401
+        command += ['--loop', 'uvloop']
+    except ImportError:
+        pass
+    try:
+        import httptools  # noqa: F401
+        command += ['--http', 'httptools']
+    except ImportError:
+        pass
+
+    if reload:
+        command.append('--reload')
+    else:
+        command += ['--workers', str(workers)]
+    return command
+
 if __name__ == '__main__':
     main()
 
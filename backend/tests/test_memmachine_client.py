@@ -0,0 +1,202 @@
+"""Tests for the MemMachine MCP client's circuit breaker, retry policy and session handling."""
+
+import asyncio
+import json
+import time
+from typing import Optional
+
+import httpx
+
+from app.services import memmachine_client
+from app.services.memmachine_client import MemMachineMCPClient, MemMachineUnavailable
+
+
+def _sse(message: dict) -> httpx.Response:
+    body = f"event: message\ndata: {json.dumps(message)}\n\n".encode()
+    return httpx.Response(200, headers={"content-type": "text/event-stream"}, content=body)
+
+
+def _make_client(requests: list, tool_statuses: Optional[list] = None) -> MemMachineMCPClient:
+    """Return a client whose pool is backed by an in-process fake MCP server.
+
+    ``tool_statuses`` lists HTTP statuses returned by successive ``tools/call``
+    requests before the fake server starts answering normally.
+    """
+    tool_statuses = list(tool_statuses or [])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.method == "GET":
+            return httpx.Response(200, headers={"mcp-session-id": "session-1"})
+        payload = json.loads(request.content)
+        if payload["method"] == "notifications/initialized":
+            return httpx.Response(202)
+        if payload["method"] == "initialize":
+            return _sse({"jsonrpc": "2.0", "id": payload["id"], "result": {}})
+        if tool_statuses:
+            return httpx.Response(tool_statuses.pop(0), text="error")
+        return _sse(
+            {
+                "jsonrpc": "2.0",
+                "id": payload["id"],
+                "result": {"structuredContent": {"status": 200, "content": []}},
+            }
+        )
+
+    client = MemMachineMCPClient(base_url="http://memmachine.test", search_cache_max_entries=0)
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def _trip(client: MemMachineMCPClient, opened_at: float) -> None:
+    """Put the client in the state left behind by a failed session initialization."""
+    client._breaker.state = "open"
+    client._breaker.fail_count = client._breaker.failure_threshold
+    client._breaker.opened_at = opened_at
+    client.session_id = None
+    client._initialization_failed = True
+
+
+def test_open_breaker_fails_fast_without_requests():
+    requests: list = []
+    client = _make_client(requests)
+    _trip(client, opened_at=time.monotonic())
+
+    async def run():
+        try:
+            await client._call_tool("search_memory", {"param": {"query": "q"}})
+        finally:
+            await client.close()
+
+    try:
+        asyncio.run(run())
+    except MemMachineUnavailable:
+        pass
+    else:
+        raise AssertionError("expected MemMachineUnavailable while the breaker is open")
+    assert requests == []
+    assert client._breaker.state == "open"
+
+
+def test_half_open_probe_reinitializes_session_and_closes_breaker():
+    requests: list = []
+    client = _make_client(requests)
+    _trip(client, opened_at=time.monotonic() - client._breaker.reset_timeout - 1)
+
+    async def run():
+        try:
+            return await client._call_tool("search_memory", {"param": {"query": "q"}})
+        finally:
+            await client.close()
+
+    # The probe admitted by before_call() must not be rejected again by the session re-init
+    result = asyncio.run(run())
+
+    assert result == {"status": 200, "content": []}
+    assert client._breaker.state == "closed"
+    assert client._breaker.fail_count == 0
+    assert client.session_id == "session-1"
+    methods = [json.loads(r.content)["method"] for r in requests if r.method == "POST"]
+    assert methods[0] == "initialize"
+    assert "tools/call" in methods
+
+
+def test_decorated_call_reinitializes_session_after_reset_timeout():
+    requests: list = []
+    client = _make_client(requests)
+    _trip(client, opened_at=time.monotonic() - client._breaker.reset_timeout - 1)
+
+    async def run():
+        try:
+            return await client.search_memory("q", user_id="user-1")
+        finally:
+            await client.close()
+
+    assert asyncio.run(run()) == []
+    assert client._breaker.state == "closed"
+
+
+def _tool_calls(requests: list) -> int:
+    return sum(1 for r in requests if r.method == "POST" and json.loads(r.content)["method"] == "tools/call")
+
+
+def _call(client: MemMachineMCPClient, idempotent: bool = True):
+    async def run():
+        try:
+            return await client._call_tool("add_memory", {"param": {"content": "c"}}, idempotent=idempotent)
+        finally:
+            await client.close()
+
+    return asyncio.run(run())
+
+
+def test_bad_request_is_not_retried():
+    requests: list = []
+    client = _make_client(requests, tool_statuses=[400])
+
+    try:
+        _call(client)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected the 400 to be raised")
+    assert _tool_calls(requests) == 1
+
+
+def test_non_idempotent_call_is_not_retried_after_gateway_error():
+    requests: list = []
+    client = _make_client(requests, tool_statuses=[502])
+
+    try:
+        _call(client, idempotent=False)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected the 502 to be raised")
+    assert _tool_calls(requests) == 1
+    assert client._breaker.fail_count == 1
+
+
+def test_retried_attempts_count_as_one_breaker_failure():
+    requests: list = []
+    client = _make_client(requests, tool_statuses=[503] * memmachine_client.RETRY_MAX_TRIES)
+
+    try:
+        _call(client, idempotent=False)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected the 503 to be raised once retries are exhausted")
+    assert _tool_calls(requests) == memmachine_client.RETRY_MAX_TRIES
+    assert client._breaker.fail_count == 1
+    assert client._breaker.state == "closed"
+
+
+def test_rate_limited_call_succeeds_on_retry():
+    requests: list = []
+    client = _make_client(requests, tool_statuses=[429])
+
+    assert _call(client, idempotent=False) == {"status": 200, "content": []}
+    assert _tool_calls(requests) == 2
+    assert client._breaker.fail_count == 0
+
+
+def test_search_started_before_invalidation_is_not_cached():
+    cache = memmachine_client._SearchCache(max_entries=8, ttl=60.0)
+    key = ("user-1", "q", 5)
+
+    generation = cache.generation("user-1")
+    cache.invalidate_user("user-1")  # add_memory completes while the search is in flight
+    cache.put(key, {"content": ["stale"]}, generation)
+
+    assert cache.get(key) is None
+
+
+def test_cached_search_results_are_not_shared_between_callers():
+    cache = memmachine_client._SearchCache(max_entries=8, ttl=60.0)
+    key = ("user-1", "q", 5)
+    cache.put(key, {"content": [{"text": "a"}]}, cache.generation("user-1"))
+
+    cache.get(key)["content"].append({"text": "mutated"})
+
+    assert cache.get(key) == {"content": [{"text": "a"}]}
@@ -0,0 +1,69 @@
+"""Tests for the gzip request-body middleware."""
+
+import asyncio
+import gzip
+
+from app.middleware import GzipRequestMiddleware
+
+
+def _run(body_chunks: list, max_body_size: int = 1024):
+    """Send ``body_chunks`` through the middleware; return (sent messages, body seen by the app)."""
+    seen: dict = {}
+
+    async def app(scope, receive, send):
+        message = await receive()
+        seen["body"] = message["body"]
+        seen["headers"] = dict(scope["headers"])
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": i < len(body_chunks) - 1}
+        for i, chunk in enumerate(body_chunks)
+    ]
+    sent: list = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/",
+        "headers": [(b"content-encoding", b"gzip"), (b"content-length", b"0")],
+    }
+    asyncio.run(GzipRequestMiddleware(app, max_body_size=max_body_size)(scope, receive, send))
+    return sent[0]["status"], seen.get("body")
+
+
+def test_inflates_gzip_body():
+    compressed = gzip.compress(b'{"texts": ["hello"]}')
+    status, body = _run([compressed[:10], compressed[10:]])
+
+    assert status == 200
+    assert body == b'{"texts": ["hello"]}'
+
+
+def test_truncated_gzip_body_is_rejected():
+    compressed = gzip.compress(b"x" * 100)
+    status, body = _run([compressed[:-8]])
+
+    assert status == 400
+    assert body is None
+
+
+def test_trailing_bytes_after_gzip_stream_are_rejected():
+    status, body = _run([gzip.compress(b"payload") + b"garbage"])
+
+    assert status == 400
+    assert body is None
+
+
+def test_oversized_inflated_body_is_rejected():
+    status, body = _run([gzip.compress(b"x" * 2048)], max_body_size=1024)
+
+    assert status == 413
+    assert body is None